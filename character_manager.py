@@ -4,18 +4,142 @@ Manages character names and provides SmartType functionality
 """
 
 import re
-from PyQt6.QtWidgets import QListWidget, QVBoxLayout, QWidget, QPushButton, QHBoxLayout, QLineEdit, QLabel
-from PyQt6.QtCore import pyqtSignal, Qt
+import bisect
+from functools import lru_cache
+from PyQt6.QtWidgets import QListView, QAbstractItemView, QVBoxLayout, QWidget, QPushButton, QHBoxLayout, QLineEdit, QLabel
+from PyQt6.QtCore import pyqtSignal, Qt, QStringListModel
 from PyQt6.QtGui import QFont
 
+# Scene heading, transition and shot prefixes that rule out a character cue
+_EXCLUDED_PREFIXES = (
+    'INT.', 'EXT.', 'INT/EXT.', 'I/E.',
+    'FADE', 'CUT', 'DISSOLVE', 'SMASH', 'MATCH', 'JUMP',
+    'CLOSE', 'WIDE', 'MEDIUM', 'EXTREME', 'POV', 'ANGLE'
+)
+
+def _build_prefix_trie(prefixes):
+    """Build a character trie whose terminal nodes mark a complete prefix"""
+    trie = {}
+    for prefix in prefixes:
+        node = trie
+        for ch in prefix:
+            node = node.setdefault(ch, {})
+        node[None] = True
+    return trie
+
+_EXCLUDED_TRIE = _build_prefix_trie(_EXCLUDED_PREFIXES)
+
+def _has_excluded_prefix(line):
+    """Check an uppercase line against every excluded prefix in one trie walk"""
+    node = _EXCLUDED_TRIE
+    for ch in line:
+        node = node.get(ch)
+        if node is None:
+            return False
+        if None in node:
+            return True
+    return False
+
+# Pre-compiled patterns used while extracting character names
+_PAREN_RE = re.compile(r'\s*\([^)]*\)\s*')
+_WS_RE = re.compile(r'\s+')
+_TRAIL_PUNCT_RE = re.compile(r'[.!?]+$')
+
+# Fragments that are never valid character names: partial scene headings,
+# transitions and shots typed so far, plus common short words
+_INVALID_NAMES = frozenset([
+    'I', 'IN', 'INT', 'E', 'EX', 'EXT',
+    'F', 'FA', 'FAD', 'FADE', 'C', 'CU', 'CUT', 'D', 'DI', 'DIS', 'DISS', 'DISSOLVE',
+    'CL', 'CLO', 'CLOSE', 'W', 'WI', 'WID', 'WIDE', 'M', 'ME', 'MED', 'MEDIUM',
+    'A', 'AN', 'THE', 'AND', 'OR', 'BUT', 'IF', 'OF', 'TO', 'ON', 'AT', 'BY', 'FOR', 'WITH'
+])
+
+def _is_valid_character_name(name):
+    """Check if a character name is valid (complete, not a fragment)"""
+    # Must be at least 2 characters long
+    if len(name) < 2:
+        return False
+    
+    # Must not be a scene heading, transition or shot fragment, or a common word
+    if name in _INVALID_NAMES:
+        return False
+    
+    return True
+
+def _is_character_line(line):
+    """Check if a line looks like a character name"""
+    # Character names are typically:
+    # - All uppercase
+    # - No periods (except for abbreviations)
+    # - Short (1-4 words)
+    # - Not scene headings or transitions
+    
+    # Cheap rejections first; most action and dialogue lines fail here
+    if not line.isupper():
+        return False
+    
+    # Exclude lines that end with periods (likely dialogue)
+    if line.endswith('.'):
+        return False
+    
+    # Too short to hold a valid name
+    if len(line) < 2:
+        return False
+    
+    # Check word count (allow 1-4 words for character names)
+    word_count = len(line.split())
+    if word_count == 0 or word_count > 4:
+        return False
+    
+    # Exclude scene headings, transitions and shot descriptions; the line is
+    # already known to be uppercase so no case folding is needed
+    if _has_excluded_prefix(line):
+        return False
+    
+    return True
+
+def _extract_character_name(line):
+    """Extract character name from a line"""
+    # Remove common prefixes/suffixes
+    name = line.strip()
+    
+    # Remove parentheticals - this also strips character modifiers such as
+    # (CONT'D), (V.O.) and (O.S.), so no separate modifier pass is needed
+    name = _PAREN_RE.sub('', name)
+    
+    # Clean up extra whitespace
+    name = _WS_RE.sub(' ', name).strip()
+    
+    # Remove any remaining punctuation at the end
+    name = _TRAIL_PUNCT_RE.sub('', name)
+    
+    return name
+
+@lru_cache(maxsize=4096)
+def character_name_from_line(line):
+    """Return the character name on a stripped line, or None if it is not one.
+
+    Character cues repeat constantly in a screenplay (JOHN speaks many times),
+    so the decision is memoized per line; the cache is bounded by maxsize.
+    """
+    if not _is_character_line(line):
+        return None
+    character_name = _extract_character_name(line)
+    if character_name and _is_valid_character_name(character_name):
+        return character_name
+    return None
+
 class CharacterManager(QWidget):
     """Manages character names and provides SmartType functionality"""
     
     character_selected = pyqtSignal(str)
+    characters_changed = pyqtSignal()
     
     def __init__(self):
         super().__init__()
         self.characters = set()
+        # Sorted mirror of self.characters, kept in step with the list model
+        self.sorted_characters = []
         self.setup_ui()
         
     def setup_ui(self):
@@ -41,8 +165,14 @@ class CharacterManager(QWidget):
         layout.addLayout(add_layout)
         
         # Character list
-        self.character_list = QListWidget()
-        self.character_list.itemDoubleClicked.connect(self.on_character_selected)
+        # Backed by a string list model so the whole list can be replaced in one call
+        self.character_model = QStringListModel()
+        self.character_list = QListView()
+        # Named so the dark theme's list rules reach it without matching every QListView
+        self.character_list.setObjectName("characterList")
+        self.character_list.setModel(self.character_model)
+        self.character_list.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.character_list.doubleClicked.connect(self.on_character_selected)
         layout.addWidget(self.character_list)
         
         # Buttons
@@ -68,22 +198,27 @@ class CharacterManager(QWidget):
         if name:
             # Convert to uppercase for consistency
             name = name.upper()
-            self.characters.add(name)
-            self.update_character_list()
+            if name not in self.characters:
+                self.characters.add(name)
+                self.insert_character_row(name)
+                self.characters_changed.emit()
             self.character_input.clear()
             
     def remove_character(self):
         """Remove selected character"""
-        current_item = self.character_list.currentItem()
-        if current_item:
-            character_name = current_item.text()
-            self.characters.discard(character_name)
-            self.update_character_list()
+        current_index = self.character_list.currentIndex()
+        if current_index.isValid():
+            character_name = current_index.data(Qt.ItemDataRole.DisplayRole)
+            if character_name in self.characters:
+                self.characters.discard(character_name)
+                self.remove_character_row(character_name)
+                self.characters_changed.emit()
             
     def clear_characters(self):
         """Clear all characters"""
         self.characters.clear()
         self.update_character_list()
+        self.characters_changed.emit()
         
     def cleanup_characters(self):
         """Clean up character list by removing invalid names and fragments"""
@@ -93,141 +228,72 @@ class CharacterManager(QWidget):
             if self.is_valid_character_name(character):
                 cleaned_characters.add(character)
                 
+        # Nothing was removed, so the list is already up to date
+        if len(cleaned_characters) == len(self.characters):
+            return
+            
         self.characters = cleaned_characters
         self.update_character_list()
+        self.characters_changed.emit()
         
     def update_character_list(self):
         """Update the character list display"""
-        self.character_list.clear()
-        for character in sorted(self.characters):
-            self.character_list.addItem(character)
+        # Re-sort once and replace the model contents in one call
+        self.sorted_characters = sorted(self.characters)
+        self.character_model.setStringList(self.sorted_characters)
+        
+    def insert_character_row(self, name):
+        """Insert a name into the sorted mirror and the list model at the same row"""
+        row = bisect.bisect_left(self.sorted_characters, name)
+        self.sorted_characters.insert(row, name)
+        self.character_model.insertRows(row, 1)
+        self.character_model.setData(self.character_model.index(row), name)
+        
+    def remove_character_row(self, name):
+        """Remove a name from the sorted mirror and the list model"""
+        row = bisect.bisect_left(self.sorted_characters, name)
+        del self.sorted_characters[row]
+        self.character_model.removeRows(row, 1)
             
-    def on_character_selected(self, item):
+    def on_character_selected(self, index):
         """Handle character selection"""
-        character_name = item.text()
+        character_name = index.data(Qt.ItemDataRole.DisplayRole)
         self.character_selected.emit(character_name)
         
-    def update_from_text(self, text):
-        """Update character list from screenplay text"""
-        # Only add names from lines that are formatted as Character (i.e., after Enter or line break)
-        lines = text.split('\n')
-        found_characters = set()
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            # Only consider lines that are likely formatted as Character
-            if self.is_character_line(line):
-                character_name = self.extract_character_name(line)
-                if character_name and self.is_valid_character_name(character_name):
-                    found_characters.add(character_name)
+    def set_characters(self, found_characters):
+        """Replace the character set with names found in the screenplay"""
+        # Work out what changed so only those rows are touched
+        added = found_characters - self.characters
+        removed = self.characters - found_characters
+        if not added and not removed:
+            return
+        
+        self.character_list.setUpdatesEnabled(False)
+        for name in removed:
+            self.remove_character_row(name)
+        for name in added:
+            self.insert_character_row(name)
+        self.character_list.setUpdatesEnabled(True)
+        
         # Replace the character set (not update) to avoid keeping partials
         self.characters = found_characters
-        self.update_character_list()
+        self.characters_changed.emit()
         
     def is_valid_character_name(self, name):
         """Check if a character name is valid (complete, not a fragment)"""
-        # Must be at least 2 characters long
-        if len(name) < 2:
-            return False
-            
-        # Must not be a scene heading fragment
-        scene_fragments = ['I', 'IN', 'INT', 'E', 'EX', 'EXT']
-        if name in scene_fragments:
-            return False
-            
-        # Must not be a transition fragment
-        transition_fragments = ['F', 'FA', 'FAD', 'FADE', 'C', 'CU', 'CUT', 'D', 'DI', 'DIS', 'DISS', 'DISSOLVE']
-        if name in transition_fragments:
-            return False
-            
-        # Must not be a shot fragment
-        shot_fragments = ['C', 'CL', 'CLO', 'CLOSE', 'W', 'WI', 'WID', 'WIDE', 'M', 'ME', 'MED', 'MEDIUM']
-        if name in shot_fragments:
-            return False
-            
-        # Must not be a single letter (except for very specific cases)
-        if len(name) == 1 and name not in ['A', 'I']:  # Allow 'A' and 'I' as valid single-letter names
-            return False
-            
-        # Must not be a common word fragment
-        common_fragments = ['A', 'AN', 'THE', 'AND', 'OR', 'BUT', 'IF', 'OF', 'TO', 'IN', 'ON', 'AT', 'BY', 'FOR', 'WITH']
-        if name in common_fragments:
-            return False
-            
-        return True
+        return _is_valid_character_name(name)
         
     def is_character_line(self, line):
         """Check if a line looks like a character name"""
-        # Character names are typically:
-        # - All uppercase
-        # - No periods (except for abbreviations)
-        # - Short (1-4 words)
-        # - Not scene headings or transitions
-        
-        if not line.isupper():
-            return False
-            
-        # Exclude scene headings
-        if re.match(r'^(INT\.|EXT\.|INT\/EXT\.|I\/E\.)', line, re.IGNORECASE):
-            return False
-            
-        # Exclude transitions
-        if re.match(r'^(FADE|CUT|DISSOLVE|SMASH|MATCH|JUMP)', line, re.IGNORECASE):
-            return False
-            
-        # Exclude shot descriptions
-        if re.match(r'^(CLOSE|WIDE|MEDIUM|EXTREME|POV|ANGLE)', line, re.IGNORECASE):
-            return False
-            
-        # Exclude lines that end with periods (likely dialogue)
-        if line.endswith('.'):
-            return False
-            
-        # Check word count (allow up to 4 words for character names)
-        words = line.split()
-        if len(words) > 4:
-            return False
-            
-        # Must have at least one word
-        if len(words) == 0:
-            return False
-            
-        return True
+        return _is_character_line(line)
         
     def extract_character_name(self, line):
         """Extract character name from a line"""
-        # Remove common prefixes/suffixes
-        name = line.strip()
-        
-        # Remove parentheticals
-        name = re.sub(r'\s*\([^)]*\)\s*', '', name)
-        
-        # Remove common character modifiers
-        modifiers = [
-            r'\s*\(CONT\'D\)\s*',
-            r'\s*\(CONTINUED\)\s*',
-            r'\s*\(V\.O\.\)\s*',
-            r'\s*\(O\.S\.\)\s*',
-            r'\s*\(O\.C\.\)\s*',
-            r'\s*\(O\.F\.F\.\)\s*'
-        ]
-        
-        for modifier in modifiers:
-            name = re.sub(modifier, '', name, flags=re.IGNORECASE)
-            
-        # Clean up extra whitespace
-        name = re.sub(r'\s+', ' ', name).strip()
-        
-        # Remove any remaining punctuation at the end
-        name = re.sub(r'[.!?]+$', '', name)
-        
-        return name
+        return _extract_character_name(line)
         
     def get_characters(self):
         """Get list of all characters"""
-        return sorted(self.characters)
+        return list(self.sorted_characters)
         
     def has_character(self, name):
         """Check if character exists"""
@@ -3,15 +3,61 @@ Export Manager
 Handles export to PDF and FDX (Final Draft XML) formats with industry-standard formatting
 """
 
-import re
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
-from lxml import etree
 from datetime import datetime
 
+# Literal prefixes used for element type detection (matched against uppercased text)
+_SCENE_PREFIXES = ('INT.', 'EXT.', 'INT/EXT.', 'I/E.')
+_TRANS_PREFIXES = ('FADE', 'CUT', 'DISSOLVE', 'SMASH', 'MATCH', 'JUMP', 'BLACK', 'WHITE')
+_SHOT_PREFIXES = ('CLOSE', 'WIDE', 'MEDIUM', 'EXTREME', 'POV', 'ANGLE', 'INSERT', 'TITLE')
+
+def _build_prefix_trie():
+    """Build a character trie mapping each literal prefix to its element type"""
+    trie = {}
+    for prefixes, element_type in ((_SCENE_PREFIXES, "Scene Heading"),
+                                   (_TRANS_PREFIXES, "Transition"),
+                                   (_SHOT_PREFIXES, "Shot")):
+        for prefix in prefixes:
+            node = trie
+            for ch in prefix:
+                node = node.setdefault(ch, {})
+            node[None] = element_type
+    return trie
+
+_PREFIX_TRIE = _build_prefix_trie()
+_MAX_PREFIX_LEN = max(len(p) for p in _SCENE_PREFIXES + _TRANS_PREFIXES + _SHOT_PREFIXES)
+
+def _classify_prefix(text):
+    """Return the element type whose prefix starts text, or None.
+
+    Walks the trie over at most the first few characters, so every prefix
+    family is tested in a single pass.
+    """
+    node = _PREFIX_TRIE
+    for ch in text[:_MAX_PREFIX_LEN].upper():
+        node = node.get(ch)
+        if node is None:
+            return None
+        if None in node:
+            return node[None]
+    return None
+
+# Single-pass escape table for reportlab paragraph markup and FDX text
+_PDF_ESCAPE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
+
+# Element types that are always printed in uppercase
+_UPPER_TYPES = frozenset(["Scene Heading", "Character", "Transition"])
+
+# Fixed FDX markup written around the screenplay paragraphs
+_FDX_HEADER = (b"<?xml version='1.0' encoding='utf-8'?>\n"
+               b'<FinalDraft DocumentType="Script" Template="No" Version="5">\n'
+               b'  <Content>\n')
+_FDX_FOOTER = b'  </Content>\n</FinalDraft>\n'
+
 class ExportManager:
     """Manages export functionality for different formats with industry-standard formatting"""
     
@@ -142,6 +188,17 @@ class ExportManager:
             alignment=TA_LEFT
         )
         
+        # Element type to style lookup, built once for get_pdf_style
+        self.pdf_style_map = {
+            "Scene Heading": self.scene_style,
+            "Action": self.action_style,
+            "Character": self.character_style,
+            "Dialogue": self.dialogue_style,
+            "Parenthetical": self.parenthetical_style,
+            "Transition": self.transition_style,
+            "Shot": self.scene_style
+        }
+        
     def export_to_pdf(self, content, file_path, title="", author="", contact_info=""):
         """Export screenplay content to PDF with industry-standard formatting"""
         # Create document with proper margins
@@ -161,20 +218,22 @@ class ExportManager:
             story.append(PageBreak())
         
         # Parse content and create PDF elements
-        lines = content.split('\n')
         page_number = 2 if title else 1  # Start page numbering on second page if title page exists
         
-        for line in lines:
+        for line in content.splitlines():
             line = line.strip()
             if not line:
                 story.append(Spacer(1, 6))
                 continue
                 
-            element_type = self.detect_element_type(line)
+            # Computed once and shared by detection and cleanup
+            is_upper = line.isupper()
+            
+            element_type = self.detect_element_type(line, is_upper)
             style = self.get_pdf_style(element_type)
             
             # Clean up the text for PDF
-            clean_text = self.clean_text_for_pdf(line, element_type)
+            clean_text = self.clean_text_for_pdf(line, element_type, is_upper)
             story.append(Paragraph(clean_text, style))
             
         doc.build(story)
@@ -204,64 +263,57 @@ class ExportManager:
         
     def export_to_fdx(self, content, file_path, title="", author="", contact_info=""):
         """Export screenplay content to FDX (Final Draft XML) with proper structure"""
-        # Create the root element
-        root = etree.Element("FinalDraft", DocumentType="Script", Template="No", Version="5")
-        
-        # Add document properties
-        content_elem = etree.SubElement(root, "Content")
+        # The FDX structure is fixed and flat, so the markup is emitted directly
+        # into a byte buffer instead of building lxml elements for every line
+        buf = bytearray(_FDX_HEADER)
         
         # Add title page if title is provided
         if title:
-            self.add_fdx_title_page(content_elem, title, author, contact_info)
+            self.add_fdx_title_page(buf, title, author, contact_info)
         
         # Parse content and create FDX elements
-        lines = content.split('\n')
-        
-        for line in lines:
+        for line in content.splitlines():
             line = line.strip()
             if not line:
                 continue
                 
             element_type = self.detect_element_type(line)
-            self.create_fdx_element(content_elem, element_type, line)
+            self.create_fdx_element(buf, element_type, line)
             
+        buf += _FDX_FOOTER
+        
         # Write to file
-        tree = etree.ElementTree(root)
-        tree.write(file_path, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        with open(file_path, 'wb') as f:
+            f.write(buf)
         
-    def add_fdx_title_page(self, parent, title, author, contact_info):
-        """Add title page to FDX"""
+    def add_fdx_title_page(self, buf, title, author, contact_info):
+        """Add title page paragraphs to the FDX buffer"""
         # Title
         if title:
-            title_para = etree.SubElement(parent, "Paragraph", Type="Title Page")
-            title_text = etree.SubElement(title_para, "Text")
-            title_text.text = title.upper()
+            self.write_fdx_paragraph(buf, "Title Page", title.upper())
             
         # Author
         if author:
-            author_para = etree.SubElement(parent, "Paragraph", Type="Title Page")
-            author_text = etree.SubElement(author_para, "Text")
-            author_text.text = f"Written by {author}"
+            self.write_fdx_paragraph(buf, "Title Page", f"Written by {author}")
             
         # Contact info
         if contact_info:
-            contact_para = etree.SubElement(parent, "Paragraph", Type="Title Page")
-            contact_text = etree.SubElement(contact_para, "Text")
-            contact_text.text = contact_info
-        
-    def detect_element_type(self, text):
-        """Detect element type from text content"""
-        # Scene heading patterns (INT./EXT./INT\/EXT./I\/E.)
-        if re.match(r'^(INT\.|EXT\.|INT\/EXT\.|I\/E\.)', text, re.IGNORECASE):
-            return "Scene Heading"
-            
-        # Transition patterns
-        if re.match(r'^(FADE|CUT|DISSOLVE|SMASH|MATCH|JUMP|BLACK|WHITE)', text, re.IGNORECASE):
-            return "Transition"
+            self.write_fdx_paragraph(buf, "Title Page", contact_info)
+        
+    def detect_element_type(self, text, is_upper=None):
+        """Detect element type from text content
+
+        is_upper may be passed when the caller already knows text.isupper().
+        """
+        prefix_type = _classify_prefix(text)
+        
+        # Scene heading (INT./EXT./INT\/EXT./I\/E.) and transition patterns
+        if prefix_type == "Scene Heading" or prefix_type == "Transition":
+            return prefix_type
             
-        # Character name patterns (all caps, no periods, not scene headings or transitions)
-        if (text.isupper() and 
-            not re.match(r'^(INT\.|EXT\.|INT\/EXT\.|I\/E\.|FADE|CUT|DISSOLVE|SMASH|MATCH|JUMP|BLACK|WHITE)', text, re.IGNORECASE) and
+        # Character name patterns (all caps, no periods; scene headings and
+        # transitions have already been ruled out above)
+        if ((text.isupper() if is_upper is None else is_upper) and 
             not text.endswith('.') and
             len(text.split()) <= 3):
             return "Character"
@@ -271,7 +323,7 @@ class ExportManager:
             return "Parenthetical"
             
         # Shot patterns
-        if re.match(r'^(CLOSE|WIDE|MEDIUM|EXTREME|POV|ANGLE|INSERT|TITLE)', text, re.IGNORECASE):
+        if prefix_type == "Shot":
             return "Shot"
             
         # Default to Action
@@ -279,36 +331,23 @@ class ExportManager:
         
     def get_pdf_style(self, element_type):
         """Get PDF style for element type"""
-        styles = {
-            "Scene Heading": self.scene_style,
-            "Action": self.action_style,
-            "Character": self.character_style,
-            "Dialogue": self.dialogue_style,
-            "Parenthetical": self.parenthetical_style,
-            "Transition": self.transition_style,
-            "Shot": self.scene_style
-        }
-        return styles.get(element_type, self.action_style)
+        return self.pdf_style_map.get(element_type, self.action_style)
         
-    def clean_text_for_pdf(self, text, element_type):
+    def clean_text_for_pdf(self, text, element_type, is_upper=False):
         """Clean text for PDF export"""
-        # Convert special characters
-        text = text.replace('&', '&amp;')
-        text = text.replace('<', '&lt;')
-        text = text.replace('>', '&gt;')
-        
-        # Ensure proper formatting
-        if element_type == "Scene Heading":
-            text = text.upper()
-        elif element_type == "Character":
-            text = text.upper()
-        elif element_type == "Transition":
+        # Ensure proper formatting; text that is already uppercase is left
+        # alone. This runs before escaping so entities like &amp; keep
+        # their lowercase spelling.
+        if element_type in _UPPER_TYPES and not is_upper:
             text = text.upper()
             
+        # Convert special characters
+        text = text.translate(_PDF_ESCAPE)
+            
         return text
         
-    def create_fdx_element(self, parent, element_type, text):
-        """Create FDX element with proper structure"""
+    def create_fdx_element(self, buf, element_type, text):
+        """Add an FDX element with proper structure to the buffer"""
         # Map element types to FDX types
         fdx_type_map = {
             "Scene Heading": "Scene Heading",
@@ -322,11 +361,14 @@ class ExportManager:
         
         fdx_type = fdx_type_map.get(element_type, "Action")
         
-        # Create the paragraph element
-        paragraph = etree.SubElement(parent, "Paragraph", Type=fdx_type)
-        
-        # Add the text
-        text_elem = etree.SubElement(paragraph, "Text")
-        text_elem.text = text
-        
-        return paragraph 
\ No newline at end of file
+        self.write_fdx_paragraph(buf, fdx_type, text)
+        
+    def write_fdx_paragraph(self, buf, fdx_type, text):
+        """Append a single escaped Paragraph element to the FDX buffer"""
+        # fdx_type always comes from our fixed type names, so only the text
+        # content needs escaping
+        buf += b'    <Paragraph Type="'
+        buf += fdx_type.encode('utf-8')
+        buf += b'"><Text>'
+        buf += text.translate(_PDF_ESCAPE).encode('utf-8')
+        buf += b'</Text></Paragraph>\n' 
\ No newline at end of file
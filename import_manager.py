@@ -3,9 +3,17 @@ Import Manager
 Handles import from FDX (Final Draft XML) format
 """
 
-import re
+import io
 from lxml import etree
 
+# Characters that end a sentence in action text
+_SENTENCE_ENDINGS = '.!?'
+
+# FDX paragraph types grouped by how their text is formatted on import
+_UPPER_TYPES = frozenset(["Scene Heading", "Character", "Transition", "Shot"])
+_PASS_TYPES = frozenset(["Dialogue", "Parenthetical"])
+_SKIP_TYPES = frozenset(["Title Page"])
+
 class ImportManager:
     """Manages import functionality for different formats"""
     
@@ -15,91 +23,90 @@ class ImportManager:
     def import_from_fdx(self, file_path):
         """Import screenplay content from FDX (Final Draft XML)"""
         try:
-            # Parse the FDX file
-            tree = etree.parse(file_path)
-            root = tree.getroot()
+            # Convert paragraphs to screenplay text, one line per paragraph
+            screenplay_text = io.StringIO()
+            line_count = 0
+            content_found = False
             
-            # Extract content
-            content_elem = root.find("Content")
-            if content_elem is None:
-                raise ValueError("No Content element found in FDX file")
+            # Stream the FDX file so paragraphs can be discarded once read,
+            # instead of holding the whole document tree in memory
+            for event, elem in etree.iterparse(file_path, events=("start", "end"),
+                                               tag=("Content", "Paragraph")):
+                content_elem = elem.getparent()
                 
-            # Convert paragraphs to screenplay text
-            screenplay_lines = []
-            
-            for paragraph in content_elem.findall("Paragraph"):
-                paragraph_type = paragraph.get("Type", "")
-                text_elem = paragraph.find("Text")
+                # Only the screenplay body (FinalDraft/Content) is imported
+                if elem.tag == "Content":
+                    if event == "start" and content_elem is not None and content_elem.getparent() is None:
+                        content_found = True
+                    continue
+                    
+                if (event != "end" or content_elem is None or content_elem.tag != "Content" or
+                        content_elem.getparent() is None or content_elem.getparent().getparent() is not None):
+                    continue
+                    
+                paragraph_type = elem.get("Type", "")
+                text_elem = elem.find("Text")
                 
                 if text_elem is not None and text_elem.text:
                     text = text_elem.text.strip()
                     if text:
                         # Format text based on paragraph type
                         formatted_text = self.format_fdx_text(text, paragraph_type)
-                        screenplay_lines.append(formatted_text)
+                        if line_count:
+                            screenplay_text.write("\n")
+                        screenplay_text.write(formatted_text)
+                        line_count += 1
                         
-            return "\n".join(screenplay_lines)
+                # Free the paragraph and any already processed siblings
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del content_elem[0]
+                    
+            if not content_found:
+                raise ValueError("No Content element found in FDX file")
+                
+            return screenplay_text.getvalue()
             
         except Exception as e:
             raise Exception(f"Error importing FDX file: {str(e)}")
             
     def format_fdx_text(self, text, paragraph_type):
         """Format text based on FDX paragraph type"""
-        # Map FDX types to our formatting
-        if paragraph_type == "Scene Heading":
-            # Scene headings should be all caps
-            return text.upper()
-            
-        elif paragraph_type == "Character":
-            # Character names should be all caps
-            return text.upper()
+        # Skip title page content for now
+        if paragraph_type in _SKIP_TYPES:
+            return ""
             
-        elif paragraph_type == "Transition":
-            # Transitions should be all caps
+        # Scene headings, character names, transitions and shots are all caps
+        if paragraph_type in _UPPER_TYPES:
             return text.upper()
             
-        elif paragraph_type == "Action":
-            # Action lines - keep as is, but capitalize first letter of sentences
-            return self.capitalize_sentences(text)
-            
-        elif paragraph_type == "Dialogue":
-            # Dialogue - keep as is
-            return text
-            
-        elif paragraph_type == "Parenthetical":
-            # Parentheticals - keep as is
+        # Dialogue and parentheticals - keep as is
+        if paragraph_type in _PASS_TYPES:
             return text
             
-        elif paragraph_type == "Shot":
-            # Shot descriptions should be all caps
-            return text.upper()
-            
-        elif paragraph_type == "Title Page":
-            # Skip title page content for now
-            return ""
-            
-        else:
-            # Default to action formatting
-            return self.capitalize_sentences(text)
-            
+        # Action lines and anything else - capitalize first letter of sentences
+        return self.capitalize_sentences(text)
+        
     def capitalize_sentences(self, text):
         """Capitalize the first letter of sentences in action text"""
-        # Split into sentences and capitalize first letter
-        sentences = re.split(r'([.!?]+)', text)
-        capitalized_sentences = []
+        # Single pass: uppercase the first character of each sentence, where a
+        # sentence starts at the beginning of the text or after . ! or ?
+        result = []
+        capitalize_next = True
         
-        for i, sentence in enumerate(sentences):
-            if i % 2 == 0:  # Even indices are sentence content
-                if sentence.strip():
-                    # Capitalize first letter
-                    sentence = sentence.strip()
-                    if sentence:
-                        sentence = sentence[0].upper() + sentence[1:]
-                capitalized_sentences.append(sentence)
-            else:  # Odd indices are punctuation
-                capitalized_sentences.append(sentence)
+        for ch in text:
+            if ch in _SENTENCE_ENDINGS:
+                capitalize_next = True
+                result.append(ch)
+            elif ch.isspace():
+                result.append(ch)
+            elif capitalize_next:
+                result.append(ch.upper())
+                capitalize_next = False
+            else:
+                result.append(ch)
                 
-        return ''.join(capitalized_sentences)
+        return ''.join(result)
         
     def detect_element_type_from_fdx(self, paragraph_type):
         """Map FDX paragraph type to our element type"""
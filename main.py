@@ -6,40 +6,258 @@ A professional screenplay writing application built with PyQt6
 
 import sys
 import os
-from PyQt6.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, QTextEdit, QToolBar, QFileDialog, QMessageBox, QLabel, QComboBox, QSplitter, QListWidget, QTabWidget, QStackedWidget
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal
-from PyQt6.QtGui import QFont, QTextCursor, QKeySequence, QTextCharFormat, QColor, QPalette, QAction
+from functools import cached_property
+from PyQt6.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, QToolBar, QFileDialog, QMessageBox, QLabel, QComboBox, QSplitter, QStackedWidget, QProgressBar
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QObject, QRunnable, QThreadPool
+from PyQt6.QtGui import QFont, QTextCursor, QKeySequence, QColor, QPalette, QAction
 from screenplay_editor import ScreenplayEditor
-from export_manager import ExportManager
-from import_manager import ImportManager
-from character_manager import CharacterManager
-from scene_manager import SceneManager
+from character_manager import CharacterManager, character_name_from_line
+from scene_manager import SceneManager, find_scene_heading_lines
 from smarttype_manager import SmartTypeManager
-from sdft_manager import SDftManager
 from title_page_manager import TitlePageManager
 
+# Separators QTextCursor.selectedText() returns, mapped the way toPlainText() does
+_PLAIN_TEXT_MAP = str.maketrans({'\u2029': '\n', '\u2028': '\n', '\u00a0': ' '})
+
+def parse_screenplay_lines(text):
+    """Find the scene headings and character names in screenplay text
+    
+    Returns the stripped scene heading lines in script order and the set of
+    character names. Scene headings come from a single regex scan; character
+    cues exclude scene heading prefixes, so no line is counted as both.
+    """
+    scene_lines = find_scene_heading_lines(text)
+    characters = set(map(character_name_from_line, map(str.strip, text.splitlines())))
+    characters.discard(None)
+    return scene_lines, characters
+            
+def _build_dark_palette():
+    """Build the dark theme palette"""
+    palette = QPalette()
+    palette.setColor(QPalette.ColorRole.Window, QColor(53, 53, 53))
+    palette.setColor(QPalette.ColorRole.WindowText, QColor(255, 255, 255))
+    palette.setColor(QPalette.ColorRole.Base, QColor(25, 25, 25))
+    palette.setColor(QPalette.ColorRole.AlternateBase, QColor(53, 53, 53))
+    palette.setColor(QPalette.ColorRole.ToolTipBase, QColor(255, 255, 255))
+    palette.setColor(QPalette.ColorRole.ToolTipText, QColor(255, 255, 255))
+    palette.setColor(QPalette.ColorRole.Text, QColor(255, 255, 255))
+    palette.setColor(QPalette.ColorRole.Button, QColor(70, 70, 70))
+    palette.setColor(QPalette.ColorRole.ButtonText, QColor(255, 255, 255))
+    palette.setColor(QPalette.ColorRole.BrightText, QColor(255, 0, 0))
+    palette.setColor(QPalette.ColorRole.Link, QColor(42, 130, 218))
+    palette.setColor(QPalette.ColorRole.Highlight, QColor(42, 130, 218))
+    palette.setColor(QPalette.ColorRole.HighlightedText, QColor(255, 255, 255))
+    
+    # Additional colors for better contrast
+    palette.setColor(QPalette.ColorRole.Light, QColor(100, 100, 100))
+    palette.setColor(QPalette.ColorRole.Midlight, QColor(80, 80, 80))
+    palette.setColor(QPalette.ColorRole.Dark, QColor(40, 40, 40))
+    palette.setColor(QPalette.ColorRole.Mid, QColor(60, 60, 60))
+    palette.setColor(QPalette.ColorRole.Shadow, QColor(20, 20, 20))
+    
+    return palette
+
+# Built once at import and shared by every window
+_DARK_PALETTE = _build_dark_palette()
+
+# Dark theme stylesheet, installed once on the QApplication so it is parsed
+# a single time for every widget and dialog
+_DARK_QSS = """
+    QPushButton {
+        background-color: #4a4a4a;
+        border: 1px solid #6a6a6a;
+        border-radius: 4px;
+        padding: 6px 12px;
+        color: white;
+        font-weight: bold;
+    }
+    QPushButton:hover {
+        background-color: #5a5a5a;
+        border: 1px solid #7a7a7a;
+    }
+    QPushButton:pressed {
+        background-color: #3a3a3a;
+        border: 1px solid #5a5a5a;
+    }
+    QPushButton:disabled {
+        background-color: #2a2a2a;
+        border: 1px solid #4a4a4a;
+        color: #6a6a6a;
+    }
+    QComboBox {
+        background-color: #4a4a4a;
+        border: 1px solid #6a6a6a;
+        border-radius: 4px;
+        padding: 4px 8px;
+        color: white;
+        min-width: 6em;
+    }
+    QComboBox::drop-down {
+        border: none;
+        width: 20px;
+    }
+    QComboBox::down-arrow {
+        image: none;
+        border-left: 5px solid transparent;
+        border-right: 5px solid transparent;
+        border-top: 5px solid white;
+        margin-right: 5px;
+    }
+    QComboBox QAbstractItemView {
+        background-color: #4a4a4a;
+        border: 1px solid #6a6a6a;
+        color: white;
+        selection-background-color: #5a5a5a;
+    }
+    QLineEdit {
+        background-color: #3a3a3a;
+        border: 1px solid #6a6a6a;
+        border-radius: 4px;
+        padding: 4px 8px;
+        color: white;
+    }
+    QLineEdit:focus {
+        border: 1px solid #7a7a7a;
+    }
+    QMainWindow QListWidget, QListView#characterList {
+        background-color: #3a3a3a;
+        border: 1px solid #6a6a6a;
+        border-radius: 4px;
+        color: white;
+        alternate-background-color: #4a4a4a;
+    }
+    QMainWindow QListWidget::item, QListView#characterList::item {
+        padding: 4px;
+        border-bottom: 1px solid #5a5a5a;
+    }
+    QMainWindow QListWidget::item:selected, QListView#characterList::item:selected {
+        background-color: #5a5a5a;
+    }
+    QMainWindow QListWidget::item:hover, QListView#characterList::item:hover {
+        background-color: #4a4a4a;
+    }
+    QTextEdit {
+        background-color: #2a2a2a;
+        border: 1px solid #6a6a6a;
+        border-radius: 4px;
+        color: white;
+        selection-background-color: #5a5a5a;
+    }
+    QLabel {
+        color: white;
+    }
+    QToolBar {
+        background-color: #4a4a4a;
+        border: none;
+        spacing: 3px;
+        padding: 3px;
+    }
+    QToolBar QToolButton {
+        background-color: transparent;
+        border: 1px solid transparent;
+        border-radius: 4px;
+        padding: 4px;
+        color: white;
+    }
+    QToolBar QToolButton:hover {
+        background-color: #5a5a5a;
+        border: 1px solid #7a7a7a;
+    }
+    QToolBar QToolButton:pressed {
+        background-color: #3a3a3a;
+        border: 1px solid #5a5a5a;
+    }
+    QMenuBar {
+        background-color: #4a4a4a;
+        color: white;
+        border-bottom: 1px solid #6a6a6a;
+    }
+    QMenuBar::item {
+        background-color: transparent;
+        padding: 6px 10px;
+    }
+    QMenuBar::item:selected {
+        background-color: #5a5a5a;
+    }
+    QMenu {
+        background-color: #4a4a4a;
+        border: 1px solid #6a6a6a;
+        color: white;
+    }
+    QMenu::item {
+        padding: 6px 20px;
+    }
+    QMenu::item:selected {
+        background-color: #5a5a5a;
+    }
+"""
+
+class FileOperationSignals(QObject):
+    """Signals used to report a background file operation back to the GUI thread"""
+    
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    
+class FileOperation(QRunnable):
+    """Runs a blocking file operation (import, export) on the thread pool"""
+    
+    def __init__(self, function, *args):
+        super().__init__()
+        self.function = function
+        self.args = args
+        # Created on the GUI thread, so emitted results are queued back to it
+        self.signals = FileOperationSignals()
+        
+    def run(self):
+        """Run the operation and emit its result or error"""
+        try:
+            result = self.function(*self.args)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+            
 class ScriptDraftApp(QMainWindow):
     def __init__(self):
         super().__init__()
-        self.setWindowTitle("ScriptDraft - Professional Screenplay Editor")
+        # set_default_title also resets the (file_path, suffix) title cache
+        self.set_default_title()
         self.setGeometry(100, 100, 1600, 900)
         
         # Initialize components
         self.smarttype_manager = SmartTypeManager()
         self.screenplay_editor = ScreenplayEditor(self.smarttype_manager)
-        self.export_manager = ExportManager()
-        self.import_manager = ImportManager()
         self.character_manager = CharacterManager()
         self.scene_manager = SceneManager()
-        self.sdft_manager = SDftManager()
         self.title_page_manager = TitlePageManager()
         
         # Current file path
         self.current_file_path = None
         
+        # (title, author, contact_info) tuple, cleared when the title page changes
+        self.title_cache = None
+        
+        # Last character/scene sets pushed to the SmartType manager
+        self.last_characters = frozenset()
+        self.last_scenes = frozenset()
+        
+        # Background file operations still running
+        self.file_operations = set()
+        
+        # Plain-text snapshot of the editor, kept in step with contentsChange
+        self.plain_text = ""
+        # Text the character and scene lists were last rebuilt from
+        self.last_scanned_text = None
+        
         # View state
         self.showing_title_page = False
         
+        # Coalesce bursts of keystrokes into a single rescan of the document
+        self.rescan_timer = QTimer(self)
+        self.rescan_timer.setSingleShot(True)
+        self.rescan_timer.setInterval(200)
+        self.rescan_timer.timeout.connect(self.rescan_text)
+        
         self.setup_ui()
         self.setup_menu()
         self.setup_toolbar()
@@ -48,6 +266,26 @@ class ScriptDraftApp(QMainWindow):
         # Set dark theme
         self.set_dark_theme()
         
+    # The file format managers pull in lxml/reportlab and are only needed once
+    # the user opens, saves, imports or exports, so they are created on first use
+    @cached_property
+    def export_manager(self):
+        """Export manager, imported on first use"""
+        from export_manager import ExportManager
+        return ExportManager()
+        
+    @cached_property
+    def import_manager(self):
+        """Import manager, imported on first use"""
+        from import_manager import ImportManager
+        return ImportManager()
+        
+    @cached_property
+    def sdft_manager(self):
+        """SDft manager, imported on first use"""
+        from sdft_manager import SDftManager
+        return SDftManager()
+        
     def setup_ui(self):
         """Setup the main user interface"""
         central_widget = QWidget()
@@ -97,7 +335,6 @@ class ScriptDraftApp(QMainWindow):
         
         # Store references to widgets for visibility control
         self.element_label = element_label
-        self.element_combo = self.element_combo
         
         center_layout.addLayout(self.element_layout)
         
@@ -129,6 +366,13 @@ class ScriptDraftApp(QMainWindow):
         # Start with screenplay editor view
         self.show_screenplay_editor()
         
+        # Busy indicator shown while a background file operation runs
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setMaximumWidth(150)
+        self.progress_bar.setVisible(False)
+        self.statusBar().addPermanentWidget(self.progress_bar)
+        
     def setup_menu(self):
         """Setup the application menu"""
         menubar = self.menuBar()
@@ -151,6 +395,9 @@ class ScriptDraftApp(QMainWindow):
         import_fdx_action.triggered.connect(self.import_fdx)
         file_menu.addAction(import_fdx_action)
         
+        # Actions that replace the document, disabled while a file operation runs
+        self.document_actions = [new_action, open_action, import_fdx_action]
+        
         save_action = QAction("&Save", self)
         save_action.setShortcut(QKeySequence.StandardKey.Save)
         save_action.triggered.connect(self.save_document)
@@ -226,6 +473,7 @@ class ScriptDraftApp(QMainWindow):
         open_action = QAction("Open", self)
         open_action.triggered.connect(self.open_document)
         toolbar.addAction(open_action)
+        self.document_actions += [new_action, open_action]
         
         save_action = QAction("Save", self)
         save_action.triggered.connect(self.save_document)
@@ -252,6 +500,7 @@ class ScriptDraftApp(QMainWindow):
     def setup_connections(self):
         """Setup signal connections"""
         self.screenplay_editor.textChanged.connect(self.on_text_changed)
+        self.screenplay_editor.document().contentsChange.connect(self.on_contents_change)
         self.screenplay_editor.element_type_changed.connect(self.on_editor_element_type_changed)
         self.character_manager.character_selected.connect(self.insert_character)
         self.scene_manager.scene_selected.connect(self.insert_scene)
@@ -259,166 +508,16 @@ class ScriptDraftApp(QMainWindow):
         # SmartType connections
         self.smarttype_manager.suggestion_selected.connect(self.insert_suggestion)
         
+        # Drop the cached title page info whenever the title page is edited
+        self.title_page_manager.title_page_updated.connect(self.invalidate_title_cache)
+        
         # Update SmartType manager when character/scene lists change
-        self.character_manager.character_selected.connect(self.update_smarttype_characters)
-        self.scene_manager.scene_selected.connect(self.update_smarttype_scenes)
+        self.character_manager.characters_changed.connect(self.update_smarttype_characters)
+        self.scene_manager.scenes_changed.connect(self.update_smarttype_scenes)
         
     def set_dark_theme(self):
         """Apply dark theme to the application"""
-        palette = QPalette()
-        palette.setColor(QPalette.ColorRole.Window, QColor(53, 53, 53))
-        palette.setColor(QPalette.ColorRole.WindowText, QColor(255, 255, 255))
-        palette.setColor(QPalette.ColorRole.Base, QColor(25, 25, 25))
-        palette.setColor(QPalette.ColorRole.AlternateBase, QColor(53, 53, 53))
-        palette.setColor(QPalette.ColorRole.ToolTipBase, QColor(255, 255, 255))
-        palette.setColor(QPalette.ColorRole.ToolTipText, QColor(255, 255, 255))
-        palette.setColor(QPalette.ColorRole.Text, QColor(255, 255, 255))
-        palette.setColor(QPalette.ColorRole.Button, QColor(70, 70, 70))
-        palette.setColor(QPalette.ColorRole.ButtonText, QColor(255, 255, 255))
-        palette.setColor(QPalette.ColorRole.BrightText, QColor(255, 0, 0))
-        palette.setColor(QPalette.ColorRole.Link, QColor(42, 130, 218))
-        palette.setColor(QPalette.ColorRole.Highlight, QColor(42, 130, 218))
-        palette.setColor(QPalette.ColorRole.HighlightedText, QColor(255, 255, 255))
-        
-        # Additional colors for better contrast
-        palette.setColor(QPalette.ColorRole.Light, QColor(100, 100, 100))
-        palette.setColor(QPalette.ColorRole.Midlight, QColor(80, 80, 80))
-        palette.setColor(QPalette.ColorRole.Dark, QColor(40, 40, 40))
-        palette.setColor(QPalette.ColorRole.Mid, QColor(60, 60, 60))
-        palette.setColor(QPalette.ColorRole.Shadow, QColor(20, 20, 20))
-        
-        self.setPalette(palette)
-        
-        # Apply stylesheet for better button styling
-        self.setStyleSheet("""
-            QPushButton {
-                background-color: #4a4a4a;
-                border: 1px solid #6a6a6a;
-                border-radius: 4px;
-                padding: 6px 12px;
-                color: white;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #5a5a5a;
-                border: 1px solid #7a7a7a;
-            }
-            QPushButton:pressed {
-                background-color: #3a3a3a;
-                border: 1px solid #5a5a5a;
-            }
-            QPushButton:disabled {
-                background-color: #2a2a2a;
-                border: 1px solid #4a4a4a;
-                color: #6a6a6a;
-            }
-            QComboBox {
-                background-color: #4a4a4a;
-                border: 1px solid #6a6a6a;
-                border-radius: 4px;
-                padding: 4px 8px;
-                color: white;
-                min-width: 6em;
-            }
-            QComboBox::drop-down {
-                border: none;
-                width: 20px;
-            }
-            QComboBox::down-arrow {
-                image: none;
-                border-left: 5px solid transparent;
-                border-right: 5px solid transparent;
-                border-top: 5px solid white;
-                margin-right: 5px;
-            }
-            QComboBox QAbstractItemView {
-                background-color: #4a4a4a;
-                border: 1px solid #6a6a6a;
-                color: white;
-                selection-background-color: #5a5a5a;
-            }
-            QLineEdit {
-                background-color: #3a3a3a;
-                border: 1px solid #6a6a6a;
-                border-radius: 4px;
-                padding: 4px 8px;
-                color: white;
-            }
-            QLineEdit:focus {
-                border: 1px solid #7a7a7a;
-            }
-            QListWidget {
-                background-color: #3a3a3a;
-                border: 1px solid #6a6a6a;
-                border-radius: 4px;
-                color: white;
-                alternate-background-color: #4a4a4a;
-            }
-            QListWidget::item {
-                padding: 4px;
-                border-bottom: 1px solid #5a5a5a;
-            }
-            QListWidget::item:selected {
-                background-color: #5a5a5a;
-            }
-            QListWidget::item:hover {
-                background-color: #4a4a4a;
-            }
-            QTextEdit {
-                background-color: #2a2a2a;
-                border: 1px solid #6a6a6a;
-                border-radius: 4px;
-                color: white;
-                selection-background-color: #5a5a5a;
-            }
-            QLabel {
-                color: white;
-            }
-            QToolBar {
-                background-color: #4a4a4a;
-                border: none;
-                spacing: 3px;
-                padding: 3px;
-            }
-            QToolBar QToolButton {
-                background-color: transparent;
-                border: 1px solid transparent;
-                border-radius: 4px;
-                padding: 4px;
-                color: white;
-            }
-            QToolBar QToolButton:hover {
-                background-color: #5a5a5a;
-                border: 1px solid #7a7a7a;
-            }
-            QToolBar QToolButton:pressed {
-                background-color: #3a3a3a;
-                border: 1px solid #5a5a5a;
-            }
-            QMenuBar {
-                background-color: #4a4a4a;
-                color: white;
-                border-bottom: 1px solid #6a6a6a;
-            }
-            QMenuBar::item {
-                background-color: transparent;
-                padding: 6px 10px;
-            }
-            QMenuBar::item:selected {
-                background-color: #5a5a5a;
-            }
-            QMenu {
-                background-color: #4a4a4a;
-                border: 1px solid #6a6a6a;
-                color: white;
-            }
-            QMenu::item {
-                padding: 6px 20px;
-            }
-            QMenu::item:selected {
-                background-color: #5a5a5a;
-            }
-        """)
+        self.setPalette(_DARK_PALETTE)
         
     def on_element_type_changed(self, element_type):
         """Handle element type selection change"""
@@ -426,20 +525,45 @@ class ScriptDraftApp(QMainWindow):
         
     def on_text_changed(self):
         """Handle text changes in the editor"""
-        # Update character and scene lists based on content
-        text = self.screenplay_editor.toPlainText()
-        self.character_manager.update_from_text(text)
-        
-        # Clean up any invalid character names that might have been added
-        self.character_manager.cleanup_characters()
-        
-        self.scene_manager.update_from_text(text)
-        
-        # Update SmartType manager with new characters and locations
-        characters = self.character_manager.get_characters()
-        scenes = self.scene_manager.get_scenes()
-        self.smarttype_manager.update_from_character_manager(characters)
-        self.smarttype_manager.update_from_scene_manager(scenes)
+        # Restart the debounce timer; the rescan runs once typing pauses
+        self.rescan_timer.start()
+        
+    def on_contents_change(self, position, chars_removed, chars_added):
+        """Splice an edit into the cached plain text instead of re-reading the document"""
+        chunk = ""
+        if chars_added:
+            document = self.screenplay_editor.document()
+            end = min(position + chars_added, document.characterCount() - 1)
+            cursor = QTextCursor(document)
+            cursor.setPosition(position)
+            cursor.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
+            chunk = cursor.selectedText().translate(_PLAIN_TEXT_MAP)
+        text = self.plain_text
+        self.plain_text = text[:position] + chunk + text[position + chars_removed:]
+        
+    def rescan_text(self):
+        """Rescan the document for characters and scenes"""
+        # Update character and scene lists based on content; fall back to a
+        # full read if the cached snapshot has drifted from the document
+        text = self.plain_text
+        if len(text) != self.screenplay_editor.document().characterCount() - 1:
+            text = self.plain_text = self.screenplay_editor.toPlainText()
+        
+        # Format-only edits (Enter, Tab, Auto-Format) also fire textChanged;
+        # the lists depend only on the text, so skip when it is unchanged.
+        # Compared as strings, which check length before contents
+        if text == self.last_scanned_text:
+            return
+        self.last_scanned_text = text
+        
+        # One parse of the text feeds both managers; the parser only returns
+        # valid character names, so no cleanup pass is needed afterwards
+        scene_lines, characters = parse_screenplay_lines(text)
+        
+        # The managers emit characters_changed/scenes_changed when their lists
+        # actually change, which keeps the SmartType manager up to date
+        self.character_manager.set_characters(characters)
+        self.scene_manager.set_scenes(scene_lines)
         
     def insert_character(self, character_name):
         """Insert a character name at cursor position"""
@@ -452,23 +576,52 @@ class ScriptDraftApp(QMainWindow):
     def new_document(self):
         """Create a new document"""
         if self.screenplay_editor.document().isModified():
-            reply = QMessageBox.question(
-                self, "Save Changes", 
+            # Ask without a nested event loop; the answer arrives via buttonClicked
+            message_box = QMessageBox(
+                QMessageBox.Icon.Question, "Save Changes",
                 "Do you want to save your changes?",
-                QMessageBox.StandardButton.Save | QMessageBox.StandardButton.Discard | QMessageBox.StandardButton.Cancel
+                QMessageBox.StandardButton.Save | QMessageBox.StandardButton.Discard | QMessageBox.StandardButton.Cancel,
+                self
+            )
+            message_box.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+            message_box.buttonClicked.connect(
+                lambda button: self.on_new_document_confirmed(message_box.standardButton(button))
             )
+            message_box.open()
+            return
             
-            if reply == QMessageBox.StandardButton.Save:
-                self.save_document()
-            elif reply == QMessageBox.StandardButton.Cancel:
-                return
-                
+        self.start_new_document()
+        
+    def on_new_document_confirmed(self, reply):
+        """Handle the answer to the save-changes prompt shown by new_document"""
+        if reply == QMessageBox.StandardButton.Save:
+            self.save_document()
+        elif reply == QMessageBox.StandardButton.Cancel:
+            return
+            
+        self.start_new_document()
+        
+    def start_new_document(self):
+        """Reset the editor to an empty document"""
         self.screenplay_editor.clear()
         
         # Set initial element type to Scene Heading for new documents
         self.screenplay_editor.set_current_element_type("Scene Heading")
         self.element_combo.setCurrentText("Scene Heading")
         
+        self.set_default_title()
+        
+    def set_title_for(self, file_path, suffix=""):
+        """Show the file name in the window title"""
+        # Skip the basename and title rebuild if the title already shows this file
+        if (file_path, suffix) == self.title_file:
+            return
+        self.title_file = (file_path, suffix)
+        self.setWindowTitle(f"ScriptDraft - {os.path.basename(file_path)}{suffix}")
+        
+    def set_default_title(self):
+        """Show the default window title"""
+        self.title_file = None
         self.setWindowTitle("ScriptDraft - Professional Screenplay Editor")
         
     def open_document(self):
@@ -481,22 +634,24 @@ class ScriptDraftApp(QMainWindow):
         if file_path:
             try:
                 if file_path.lower().endswith('.fdx'):
-                    # Import FDX file
-                    content = self.import_manager.import_from_fdx(file_path)
-                    self.screenplay_editor.set_formatted_text(content)
-                    self.setWindowTitle(f"ScriptDraft - {os.path.basename(file_path)} (FDX Import)")
+                    # Import FDX file in the background
+                    self.run_file_operation(
+                        lambda content: self.on_fdx_imported(content, file_path),
+                        "Could not open file",
+                        self.import_manager.import_from_fdx, file_path
+                    )
                 elif file_path.lower().endswith('.sdft'):
                     # Load SDft file
                     if self.sdft_manager.load_document(self.screenplay_editor, self.title_page_manager, file_path):
                         self.current_file_path = file_path
-                        self.setWindowTitle(f"ScriptDraft - {os.path.basename(file_path)}")
+                        self.set_title_for(file_path)
                         self.screenplay_editor.document().setModified(False)
                 else:
-                    # Open text file
+                    # Open text file, streaming it into the editor in chunks
+                    # rather than reading the whole file into one string
                     with open(file_path, 'r', encoding='utf-8') as file:
-                        content = file.read()
-                        self.screenplay_editor.set_formatted_text(content)
-                        self.setWindowTitle(f"ScriptDraft - {os.path.basename(file_path)}")
+                        self.screenplay_editor.set_formatted_text_chunks(iter(lambda: file.read(65536), ''))
+                        self.set_title_for(file_path)
                         
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Could not open file: {str(e)}")
@@ -533,7 +688,7 @@ class ScriptDraftApp(QMainWindow):
                     # Save as SDft format
                     if self.sdft_manager.save_document(self.screenplay_editor, self.title_page_manager, file_path):
                         self.current_file_path = file_path
-                        self.setWindowTitle(f"ScriptDraft - {os.path.basename(file_path)}")
+                        self.set_title_for(file_path)
                         self.screenplay_editor.document().setModified(False)
                 else:
                     # Save as text file
@@ -541,7 +696,7 @@ class ScriptDraftApp(QMainWindow):
                     with open(file_path, 'w', encoding='utf-8') as file:
                         file.write(content)
                     self.current_file_path = file_path
-                    self.setWindowTitle(f"ScriptDraft - {os.path.basename(file_path)}")
+                    self.set_title_for(file_path)
                     self.screenplay_editor.document().setModified(False)
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Could not save file: {str(e)}")
@@ -559,8 +714,11 @@ class ScriptDraftApp(QMainWindow):
                 title, author, contact_info = self.get_title_page_info()
                 
                 content = self.screenplay_editor.toPlainText()
-                self.export_manager.export_to_pdf(content, file_path, title, author, contact_info)
-                QMessageBox.information(self, "Success", "PDF exported successfully!")
+                self.run_file_operation(
+                    lambda result: QMessageBox.information(self, "Success", "PDF exported successfully!"),
+                    "Could not export PDF",
+                    self.export_manager.export_to_pdf, content, file_path, title, author, contact_info
+                )
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Could not export PDF: {str(e)}")
                 
@@ -577,19 +735,28 @@ class ScriptDraftApp(QMainWindow):
                 title, author, contact_info = self.get_title_page_info()
                 
                 content = self.screenplay_editor.toPlainText()
-                self.export_manager.export_to_fdx(content, file_path, title, author, contact_info)
-                QMessageBox.information(self, "Success", "FDX exported successfully!")
+                self.run_file_operation(
+                    lambda result: QMessageBox.information(self, "Success", "FDX exported successfully!"),
+                    "Could not export FDX",
+                    self.export_manager.export_to_fdx, content, file_path, title, author, contact_info
+                )
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Could not export FDX: {str(e)}")
                 
     def get_title_page_info(self):
         """Get title page information from title page manager"""
-        title_page_info = self.title_page_manager.get_title_page_info()
-        return (
-            title_page_info.get('title', ''),
-            title_page_info.get('author', ''),
-            title_page_info.get('contact_info', '')
-        )
+        if self.title_cache is None:
+            title_page_info = self.title_page_manager.get_title_page_info()
+            self.title_cache = (
+                title_page_info.get('title', ''),
+                title_page_info.get('author', ''),
+                title_page_info.get('contact_info', '')
+            )
+        return self.title_cache
+        
+    def invalidate_title_cache(self):
+        """Forget the cached title page information"""
+        self.title_cache = None
         
     def auto_format(self):
         """Auto-format the entire document"""
@@ -637,26 +804,78 @@ class ScriptDraftApp(QMainWindow):
         
         if file_path:
             try:
-                content = self.import_manager.import_from_fdx(file_path)
-                self.screenplay_editor.set_formatted_text(content)
-                self.setWindowTitle(f"ScriptDraft - {os.path.basename(file_path)} (FDX Import)")
-                QMessageBox.information(self, "Success", "FDX file imported successfully!")
+                self.run_file_operation(
+                    lambda content: self.on_fdx_imported(content, file_path, True),
+                    "Could not import FDX file",
+                    self.import_manager.import_from_fdx, file_path
+                )
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Could not import FDX file: {str(e)}")
+                
+    def on_fdx_imported(self, content, file_path, show_message=False):
+        """Load imported FDX content into the editor"""
+        self.screenplay_editor.set_formatted_text(content)
+        self.set_title_for(file_path, " (FDX Import)")
+        if show_message:
+            QMessageBox.information(self, "Success", "FDX file imported successfully!")
+            
+    def run_file_operation(self, on_finished, error_message, function, *args):
+        """Run a blocking file operation on the thread pool
+        
+        on_finished is called on the GUI thread with the operation's result;
+        failures are reported with error_message as the dialog prefix.
+        """
+        operation = FileOperation(function, *args)
+        
+        def finish_operation():
+            self.file_operations.discard(operation)
+            self.update_file_operation_state()
+            
+        def on_success(result):
+            finish_operation()
+            on_finished(result)
+            
+        def on_failure(error):
+            finish_operation()
+            QMessageBox.critical(self, "Error", f"{error_message}: {error}")
+            
+        operation.signals.finished.connect(on_success)
+        operation.signals.failed.connect(on_failure)
+        
+        # Keep a reference until the operation reports back
+        self.file_operations.add(operation)
+        self.update_file_operation_state()
+        QThreadPool.globalInstance().start(operation)
+        
+    def update_file_operation_state(self):
+        """Lock the document while background file operations are running"""
+        # An import replaces the whole document when it finishes, so typing
+        # or starting another load in the meantime would be silently lost
+        busy = bool(self.file_operations)
+        self.progress_bar.setVisible(busy)
+        self.screenplay_editor.setReadOnly(busy)
+        for action in self.document_actions:
+            action.setEnabled(not busy)
 
     def insert_suggestion(self, suggestion):
         """Insert a SmartType suggestion at cursor position"""
         self.screenplay_editor.insert_suggestion(suggestion)
         
-    def update_smarttype_characters(self, character_name):
-        """Update SmartType manager with new character"""
-        characters = self.character_manager.get_characters()
-        self.smarttype_manager.update_from_character_manager(characters)
-        
-    def update_smarttype_scenes(self, scene_name):
-        """Update SmartType manager with new scene"""
-        scenes = self.scene_manager.get_scenes()
-        self.smarttype_manager.update_from_scene_manager(scenes)
+    def update_smarttype_characters(self):
+        """Update SmartType manager with the current characters"""
+        characters = frozenset(self.character_manager.get_characters())
+        # Skip the push if the set is the same as the last one sent
+        if characters != self.last_characters:
+            self.last_characters = characters
+            self.smarttype_manager.update_from_character_manager(characters)
+        
+    def update_smarttype_scenes(self):
+        """Update SmartType manager with the current scenes"""
+        scenes = frozenset(self.scene_manager.get_scenes())
+        # Skip the push if the set is the same as the last one sent
+        if scenes != self.last_scenes:
+            self.last_scenes = scenes
+            self.smarttype_manager.update_from_scene_manager(scenes)
 
     def toggle_title_page(self):
         """Toggle between screenplay editor and title page"""
@@ -690,6 +909,7 @@ def main():
     app = QApplication(sys.argv)
     app.setApplicationName("ScriptDraft")
     app.setApplicationVersion("1.0.0")
+    app.setStyleSheet(_DARK_QSS)
     
     window = ScriptDraftApp()
     window.show()
@@ -8,14 +8,48 @@ from PyQt6.QtWidgets import QListWidget, QVBoxLayout, QWidget, QPushButton, QHBo
 from PyQt6.QtCore import pyqtSignal, Qt
 from PyQt6.QtGui import QFont
 
+# Scene heading prefixes, matched case-insensitively with str.startswith
+_SCENE_PREFIXES = ('INT.', 'EXT.', 'INT/EXT.', 'I/E.')
+# Longest prefix above, so only that much of a line needs uppercasing
+_MAX_PREFIX_LEN = 8
+
+# Pre-compiled patterns used on every rescan
+# A whole scene heading line (leading whitespace skipped) in multi-line text; the
+# prefixes are spelled out as character classes rather than using re.IGNORECASE
+_SCENE_LINE_RE = re.compile(
+    r'^[^\S\n]*((?:[Ii][Nn][Tt](?:/[Ee][Xx][Tt])?|[Ee][Xx][Tt]|[Ii]/[Ee])\.[^\n]*)', re.MULTILINE)
+_WS_RE = re.compile(r'\s+')
+
+def is_scene_heading_line(line):
+    """Check if a stripped line is a scene heading (INT./EXT./INT/EXT./I/E.)"""
+    return line[:_MAX_PREFIX_LEN].upper().startswith(_SCENE_PREFIXES)
+
+def find_scene_heading_lines(text):
+    """Return the stripped scene heading lines of multi-line text, in order"""
+    # One multi-line scan finds them without a Python loop over every line
+    return [match.group(1).strip() for match in _SCENE_LINE_RE.finditer(text)]
+
+def _scene_location(line):
+    """Return the location of a scene heading (the text after its prefix, up to any '-')"""
+    head = line[:_MAX_PREFIX_LEN].upper()
+    for prefix in _SCENE_PREFIXES:
+        if head.startswith(prefix):
+            return line[len(prefix):].split('-', 1)[0].strip()
+    return None
+
 class SceneManager(QWidget):
     """Manages scene headings and provides scene navigation"""
     
     scene_selected = pyqtSignal(str)
+    scenes_changed = pyqtSignal()
     
     def __init__(self):
         super().__init__()
         self.scenes = []
+        # Set mirror of self.scenes for constant-time membership tests
+        self.scenes_set = set()
+        # Scenes currently shown in the list widget, in row order
+        self.displayed_scenes = []
         self.locations = set()
         self.setup_ui()
         
@@ -43,6 +77,8 @@ class SceneManager(QWidget):
         
         # Scene list
         self.scene_list = QListWidget()
+        # Every row is a single line of text, so item sizes need not be measured
+        self.scene_list.setUniformItemSizes(True)
         self.scene_list.itemDoubleClicked.connect(self.on_scene_selected)
         layout.addWidget(self.scene_list)
         
@@ -64,15 +100,17 @@ class SceneManager(QWidget):
         scene = self.scene_input.text().strip()
         if scene:
             # Ensure proper scene heading format
-            if not scene.upper().startswith(('INT.', 'EXT.', 'INT/EXT.', 'I/E.')):
+            if not scene.upper().startswith(_SCENE_PREFIXES):
                 scene = f"INT. {scene}"
             
             # Convert to uppercase for consistency
             scene = scene.upper()
             
-            if scene not in self.scenes:
+            if scene not in self.scenes_set:
+                self.scenes_set.add(scene)
                 self.scenes.append(scene)
                 self.update_scene_list()
+                self.scenes_changed.emit()
             
             self.scene_input.clear()
             
@@ -81,53 +119,85 @@ class SceneManager(QWidget):
         current_item = self.scene_list.currentItem()
         if current_item:
             scene_name = current_item.text()
-            if scene_name in self.scenes:
+            if scene_name in self.scenes_set:
+                self.scenes_set.discard(scene_name)
                 self.scenes.remove(scene_name)
                 self.update_scene_list()
+                self.scenes_changed.emit()
             
     def clear_scenes(self):
         """Clear all scenes"""
         self.scenes.clear()
+        self.scenes_set.clear()
         self.update_scene_list()
+        self.scenes_changed.emit()
         
     def update_scene_list(self):
         """Update the scene list display"""
-        self.scene_list.clear()
-        for scene in self.scenes:
-            self.scene_list.addItem(scene)
+        old = self.displayed_scenes
+        new = self.scenes
+        if old == new:
+            return
+            
+        # Only touch the rows between the unchanged head and tail; typical
+        # edits add or remove a single scene
+        prefix = 0
+        limit = min(len(old), len(new))
+        while prefix < limit and old[prefix] == new[prefix]:
+            prefix += 1
+        suffix = 0
+        limit -= prefix
+        while suffix < limit and old[-1 - suffix] == new[-1 - suffix]:
+            suffix += 1
+            
+        self.scene_list.setUpdatesEnabled(False)
+        self.scene_list.blockSignals(True)
+        try:
+            if prefix == 0 and suffix == 0:
+                # Nothing in common (e.g. a newly loaded script), so rebuild in bulk
+                self.scene_list.clear()
+                self.scene_list.addItems(new)
+            else:
+                for _ in range(len(old) - prefix - suffix):
+                    self.scene_list.takeItem(prefix)
+                for row, scene in enumerate(new[prefix:len(new) - suffix], prefix):
+                    self.scene_list.insertItem(row, scene)
+        finally:
+            self.scene_list.blockSignals(False)
+            self.scene_list.setUpdatesEnabled(True)
+            self.scene_list.viewport().update()
+        
+        self.displayed_scenes = list(new)
             
     def on_scene_selected(self, item):
         """Handle scene selection"""
         scene_name = item.text()
         self.scene_selected.emit(scene_name)
         
-    def update_from_text(self, text):
-        """Update scene list from screenplay text"""
-        # Only add locations from lines that are valid scene headings (not partials)
-        lines = text.split('\n')
-        found_scenes = []
+    def set_scenes(self, heading_lines):
+        """Replace the scene list from stripped scene heading lines, in script order"""
+        # A dict is used as an insertion-ordered set to drop repeated headings
+        found_scenes = {}
         found_locations = set()
         
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            # Only consider lines that are valid scene headings
-            if self.is_scene_heading(line):
-                scene_name = self.extract_scene_heading(line)
-                if scene_name and scene_name not in found_scenes:
-                    found_scenes.append(scene_name)
-                # Extract location part (after INT./EXT./etc.)
-                match = re.match(r'^(INT\.|EXT\.|INT\/EXT\.|I\/E\.)\s*([^\-]+)', line, re.IGNORECASE)
-                if match:
-                    location = match.group(2).strip()
-                    # Only add if it's a valid location (not partial)
-                    if location and len(location) > 1:
-                        found_locations.add(location)
+        for line in heading_lines:
+            scene_name = self.extract_scene_heading(line)
+            if scene_name:
+                found_scenes[scene_name] = None
+            # Extract location part (after INT./EXT./etc.)
+            location = _scene_location(line)
+            # Only add if it's a valid location (not partial)
+            if location and len(location) > 1:
+                found_locations.add(location)
         # Update the scene list
+        found_scenes = list(found_scenes)
+        scenes_changed = found_scenes != self.scenes
         self.scenes = found_scenes
+        self.scenes_set = set(found_scenes)
         self.locations = found_locations
         self.update_scene_list()
+        if scenes_changed:
+            self.scenes_changed.emit()
         # Optionally: update a locations list widget if you have one
         
     def is_scene_heading(self, line):
@@ -137,7 +207,7 @@ class SceneManager(QWidget):
         # - EXT. (Exterior)
         # - INT/EXT. or I/E. (Interior/Exterior)
         
-        return re.match(r'^(INT\.|EXT\.|INT\/EXT\.|I\/E\.)', line, re.IGNORECASE) is not None
+        return is_scene_heading_line(line)
         
     def extract_scene_heading(self, line):
         """Extract scene heading from a line"""
@@ -145,7 +215,7 @@ class SceneManager(QWidget):
         scene = line.strip()
         
         # Remove any trailing periods or extra spaces
-        scene = re.sub(r'\s+', ' ', scene)
+        scene = _WS_RE.sub(' ', scene)
         
         return scene.upper()
         
@@ -155,7 +225,8 @@ class SceneManager(QWidget):
         
     def has_scene(self, scene_name):
         """Check if scene exists"""
-        return scene_name.upper() in [s.upper() for s in self.scenes]
+        # Scenes are always stored uppercase
+        return scene_name.upper() in self.scenes_set
         
     def get_scene_count(self):
         """Get the number of scenes"""
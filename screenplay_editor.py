@@ -5,9 +5,58 @@ Handles the main text editing with screenplay-specific formatting
 
 import re
 from PyQt6.QtWidgets import QTextEdit, QApplication
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer
 from PyQt6.QtGui import QFont, QTextCursor, QTextCharFormat, QColor, QKeyEvent, QTextBlockFormat, QTextListFormat
 
+# Fixed element prefixes; lines are matched case-insensitively
+_SCENE_PREFIXES = ('INT.', 'EXT.', 'INT/EXT.', 'I/E.')
+_TRANSITION_PREFIXES = ('FADE', 'CUT', 'DISSOLVE', 'SMASH', 'MATCH', 'JUMP')
+_SHOT_PREFIXES = ('CLOSE', 'WIDE', 'MEDIUM', 'EXTREME', 'POV', 'ANGLE')
+# Longest prefix above, so only that much of a line needs uppercasing
+_MAX_PREFIX_LEN = 8
+
+def _classify_line(text):
+    """Return "scene", "trans", "shot" or "paren" for a line's prefix, or None"""
+    head = text[:_MAX_PREFIX_LEN].upper()
+    if head.startswith(_SCENE_PREFIXES):
+        return "scene"
+    if head.startswith(_TRANSITION_PREFIXES):
+        return "trans"
+    if head.startswith(_SHOT_PREFIXES):
+        return "shot"
+    if text.startswith('(') and text.endswith(')'):
+        return "paren"
+    return None
+
+# Runs of characters that count as a word; [^\W_] matches exactly str.isalnum
+_WORD_CHARS_RE = re.compile(r'[^\W_]*')
+
+def _word_bounds(text, position):
+    """Return the start and end of the alphanumeric word around position in text"""
+    start = position - _WORD_CHARS_RE.match(text[:position][::-1]).end()
+    end = _WORD_CHARS_RE.match(text, position).end()
+    return start, end
+
+# Block user state recorded for each element type once its format is applied
+_ELEMENT_STATES = {
+    "Action": 0, "Scene Heading": 1, "Character": 2, "Dialogue": 3,
+    "Parenthetical": 4, "Transition": 5, "Shot": 6
+}
+
+# Element indents in pixels, converting inches at 96 DPI (1 inch = 96 pixels)
+_INCH = 96
+_CHARACTER_LEFT = 4 * _INCH
+_DIALOGUE_LEFT = int(2.5 * _INCH)
+_DIALOGUE_RIGHT = 2 * _INCH
+_PARENTHETICAL_LEFT = int(3.5 * _INCH)
+_PARENTHETICAL_RIGHT = int(2.5 * _INCH)
+
+# Element a Tab press switches to, keyed by the current element ("" for an empty line)
+_TAB_NEXT = {
+    "": "Character", "Action": "Character", "Character": "Dialogue",
+    "Dialogue": "Parenthetical", "Parenthetical": "Dialogue"
+}
+
 class ScreenplayEditor(QTextEdit):
     """Main screenplay editor with industry-standard formatting"""
     
@@ -16,6 +65,8 @@ class ScreenplayEditor(QTextEdit):
     def __init__(self, smarttype_manager=None):
         super().__init__()
         self.current_element_type = "Scene Heading"  # Start with Scene Heading
+        # (block number, text) of the line last checked for its element type
+        self.last_checked_line = None
         self.smarttype_manager = smarttype_manager
         self.setup_editor()
         self.setup_formats()
@@ -40,16 +91,20 @@ class ScreenplayEditor(QTextEdit):
         # Enable undo/redo
         self.document().setUndoRedoEnabled(True)
         
-        # Set background color for better visibility
-        self.setStyleSheet("""
-            QTextEdit {
-                background-color: #2a2a2a;
-                color: white;
-                border: 1px solid #6a6a6a;
-                border-radius: 4px;
-                padding: 8px;
-            }
-        """)
+        # Screenplays are plain text with per-block formatting, so skip the
+        # HTML import path on paste and drop
+        self.setAcceptRichText(False)
+        
+        # Background, text colour and border come from the application
+        # stylesheet's QTextEdit rule, so the editor needs no stylesheet of
+        # its own; only its padding is kept, as a viewport margin
+        self.setViewportMargins(8, 8, 8, 8)
+        
+        # Element type detection waits for a pause in typing
+        self.classify_timer = QTimer(self)
+        self.classify_timer.setSingleShot(True)
+        self.classify_timer.setInterval(100)
+        self.classify_timer.timeout.connect(self.check_current_line_element_type)
         
         # Connect text change signal for SmartType
         self.textChanged.connect(self.on_text_changed)
@@ -58,77 +113,83 @@ class ScreenplayEditor(QTextEdit):
         """Setup connections to SmartType manager"""
         if self.smarttype_manager:
             self.smarttype_manager.suggestion_selected.connect(self.insert_suggestion)
+            self.smarttype_manager.set_editor(self)
             
     def on_text_changed(self):
         """Handle text changes for SmartType processing and element type detection"""
         if self.smarttype_manager:
+            # Words never span lines, so only the current block is needed
             cursor = self.textCursor()
-            text = self.toPlainText()
-            cursor_position = cursor.position()
+            text = cursor.block().text()
+            cursor_position = cursor.positionInBlock()
             self.smarttype_manager.process_text_input(text, cursor_position)
             
-        # Check if current line should be a different element type
-        self.check_current_line_element_type()
+        # Check if current line should be a different element type once
+        # typing pauses, so a burst of keystrokes is classified only once
+        self.classify_timer.start()
         
     def check_current_line_element_type(self):
         """Check if the current line should be formatted as a different element type"""
         cursor = self.textCursor()
-        current_line = cursor.block().text().strip()
+        block = cursor.block()
+        text = block.text()
+        
+        # Format-only changes (including our own) leave the line text as it
+        # was, so there is nothing new to detect
+        line_key = (block.blockNumber(), text)
+        if line_key == self.last_checked_line:
+            return
+        self.last_checked_line = line_key
         
+        current_line = text.strip()
         if current_line:
             detected_type = self.detect_element_type(current_line)
             
-            # If the detected type is different from current type, update it
-            if detected_type != self.current_element_type:
-                self.current_element_type = detected_type
-                self.apply_format_to_current_line(detected_type)
-                self.element_type_changed.emit(detected_type)
-        
+            # If the detected type is different from current type, or the line
+            # has not been formatted as that type yet, update it
+            if (detected_type != self.current_element_type or
+                    block.userState() != _ELEMENT_STATES[detected_type]):
+                self.switch_element_type(detected_type)
+        
+    def flush_element_type_check(self):
+        """Classify the current line now if a check is still waiting for typing to pause"""
+        # Enter and Tab format a line themselves, which cancels the pending
+        # check; run it first so the line just typed is not left unclassified
+        if self.classify_timer.isActive():
+            self.classify_timer.stop()
+            self.check_current_line_element_type()
+            
     def insert_suggestion(self, suggestion):
         """Insert a SmartType suggestion at the current cursor position, replacing the current word"""
         cursor = self.textCursor()
-        text = self.toPlainText()
-        position = cursor.position()
-        
-        # Find the start of the current word
-        start = position
-        while start > 0 and text[start - 1].isalnum():
-            start -= 1
-        # Find the end of the current word
-        end = position
-        while end < len(text) and text[end].isalnum():
-            end += 1
+        block = cursor.block()
+        block_position = block.position()
+        text = block.text()
+        
+        # Find the current word around the cursor
+        start, end = _word_bounds(text, cursor.positionInBlock())
         
         # Select the current word
-        cursor.setPosition(start)
-        cursor.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
+        cursor.setPosition(block_position + start)
+        cursor.setPosition(block_position + end, QTextCursor.MoveMode.KeepAnchor)
         
         # Replace with the suggestion
         cursor.insertText(suggestion)
         
         # Update cursor position
-        cursor.setPosition(start + len(suggestion))
+        cursor.setPosition(block_position + start + len(suggestion))
         self.setTextCursor(cursor)
         
     def get_current_word(self):
         """Get the current word being typed at cursor position"""
         cursor = self.textCursor()
-        text = self.toPlainText()
-        position = cursor.position()
+        text = cursor.block().text()
+        position = cursor.positionInBlock()
         
         if position > len(text):
             return ""
             
-        # Find the start of the current word
-        start = position
-        while start > 0 and text[start - 1].isalnum():
-            start -= 1
-            
-        # Find the end of the current word
-        end = position
-        while end < len(text) and text[end].isalnum():
-            end += 1
-            
+        start, end = _word_bounds(text, position)
         return text[start:end]
         
     def set_smarttype_manager(self, smarttype_manager):
@@ -148,6 +209,13 @@ class ScreenplayEditor(QTextEdit):
             "Shot": self.create_shot_format()
         }
         
+        # Block formats are built once per element type and reused on every
+        # Enter, Tab and re-classification
+        self.block_formats = {
+            element_type: self.create_block_format(element_type)
+            for element_type in self.formats
+        }
+        
     def create_scene_heading_format(self):
         """Create format for scene headings - all caps, bold, no indentation"""
         format = QTextCharFormat()
@@ -221,6 +289,7 @@ class ScreenplayEditor(QTextEdit):
                     
     def handle_enter_key(self):
         """Handle Enter key for automatic element type switching"""
+        self.flush_element_type_check()
         cursor = self.textCursor()
         current_line = cursor.block().text().strip()
         
@@ -240,46 +309,34 @@ class ScreenplayEditor(QTextEdit):
         
     def handle_tab_key(self):
         """Handle Tab key for indentation and element switching"""
+        self.flush_element_type_check()
         cursor = self.textCursor()
         current_line = cursor.block().text().strip()
         
-        # If current line is empty or action, convert to character
-        if not current_line or self.current_element_type == "Action":
-            self.current_element_type = "Character"
-            self.apply_format_to_current_line("Character")
-            self.element_type_changed.emit("Character")
-        # If current line is character, convert to dialogue
-        elif self.current_element_type == "Character":
-            self.current_element_type = "Dialogue"
-            self.apply_format_to_current_line("Dialogue")
-            self.element_type_changed.emit("Dialogue")
-        # If current line is dialogue, convert to parenthetical
-        elif self.current_element_type == "Dialogue":
-            self.current_element_type = "Parenthetical"
-            self.apply_format_to_current_line("Parenthetical")
-            self.element_type_changed.emit("Parenthetical")
-        # If current line is parenthetical, convert back to dialogue
-        elif self.current_element_type == "Parenthetical":
-            self.current_element_type = "Dialogue"
-            self.apply_format_to_current_line("Dialogue")
-            self.element_type_changed.emit("Dialogue")
+        # Empty lines and Action become Character; Character, Dialogue and
+        # Parenthetical cycle through the dialogue elements
+        key = self.current_element_type if current_line else ""
+        next_type = _TAB_NEXT.get(key)
+        if next_type:
+            self.switch_element_type(next_type)
         # Otherwise, insert tab
         else:
             cursor.insertText("\t")
             
     def determine_next_element_type(self, current_line):
         """Determine the next element type based on current line content"""
+        kind = _classify_line(current_line)
+        
         # Scene heading patterns - always followed by Action
-        if re.match(r'^(INT\.|EXT\.|INT\/EXT\.|I\/E\.)', current_line, re.IGNORECASE):
+        if kind == "scene":
             return "Action"
             
         # Character name patterns (all caps, no periods, not scene headings or transitions)
         # More reliable detection for character names - check if it looks like a character name
-        if (current_line.isupper() and 
-            not re.match(r'^(INT\.|EXT\.|INT\/EXT\.|I\/E\.|FADE|CUT|DISSOLVE|SMASH|MATCH|JUMP)', current_line, re.IGNORECASE) and
+        if (kind != "trans" and
+            current_line.isupper() and
             not current_line.endswith('.') and
-            len(current_line.split()) <= 4 and  # Allow up to 4 words for character names
-            len(current_line) > 0):
+            len(current_line.split()) <= 4):  # Allow up to 4 words for character names
             return "Dialogue"
             
         # Also check if current element type is Character (for indented character names)
@@ -287,18 +344,14 @@ class ScreenplayEditor(QTextEdit):
             return "Dialogue"
             
         # Transition patterns - followed by Scene Heading
-        if re.match(r'^(FADE|CUT|DISSOLVE|SMASH|MATCH|JUMP)', current_line, re.IGNORECASE):
+        if kind == "trans":
             return "Scene Heading"
             
         # Parenthetical patterns - followed by Dialogue
-        if current_line.startswith('(') and current_line.endswith(')'):
+        if kind == "paren":
             return "Dialogue"
             
-        # Shot patterns - followed by Action
-        if re.match(r'^(CLOSE|WIDE|MEDIUM|EXTREME|POV|ANGLE)', current_line, re.IGNORECASE):
-            return "Action"
-            
-        # Default to Action for most cases
+        # Shot patterns and everything else - followed by Action
         return "Action"
         
     def apply_format_to_current_line(self, element_type):
@@ -318,16 +371,26 @@ class ScreenplayEditor(QTextEdit):
         block_format = self.get_block_format(element_type)
         cursor.setBlockFormat(block_format)
         
+        # Remember which element type the block is formatted as
+        self.mark_element_type(block, element_type)
+        
+        # The format change re-arms the classify timer; an explicit format
+        # (Enter, Tab, element selector) should not be re-detected afterwards
+        self.classify_timer.stop()
+        
+    def mark_element_type(self, block, element_type):
+        """Record on block the element type its formatting was applied for"""
+        block.setUserState(_ELEMENT_STATES.get(element_type, -1))
+        
     def get_block_format(self, element_type):
         """Get block format for proper indentation and alignment"""
-        from PyQt6.QtGui import QTextBlockFormat
+        # Unknown types get the default format, which is the same as Action's
+        return self.block_formats.get(element_type, self.block_formats["Action"])
         
+    def create_block_format(self, element_type):
+        """Create block format for proper indentation and alignment"""
         block_format = QTextBlockFormat()
         
-        # Convert inches to pixels (assuming 96 DPI)
-        # 1 inch = 96 pixels
-        inch_to_pixels = 96
-        
         if element_type == "Scene Heading":
             # Scene headings: no indentation, left-aligned
             block_format.setIndent(0)
@@ -345,7 +408,7 @@ class ScreenplayEditor(QTextEdit):
         elif element_type == "Character":
             # Character names: indented to 4" from left margin
             block_format.setIndent(0)
-            block_format.setLeftMargin(4 * inch_to_pixels)  # 4 inches from left
+            block_format.setLeftMargin(_CHARACTER_LEFT)  # 4 inches from left
             block_format.setAlignment(Qt.AlignmentFlag.AlignLeft)
             block_format.setTopMargin(12)
             block_format.setBottomMargin(6)
@@ -353,8 +416,8 @@ class ScreenplayEditor(QTextEdit):
         elif element_type == "Dialogue":
             # Dialogue: indented to 2.5" from left margin, 2" from right margin
             block_format.setIndent(0)
-            block_format.setLeftMargin(2.5 * inch_to_pixels)  # 2.5 inches from left
-            block_format.setRightMargin(2 * inch_to_pixels)   # 2 inches from right
+            block_format.setLeftMargin(_DIALOGUE_LEFT)  # 2.5 inches from left
+            block_format.setRightMargin(_DIALOGUE_RIGHT)   # 2 inches from right
             block_format.setAlignment(Qt.AlignmentFlag.AlignLeft)
             block_format.setTopMargin(6)
             block_format.setBottomMargin(6)
@@ -362,8 +425,8 @@ class ScreenplayEditor(QTextEdit):
         elif element_type == "Parenthetical":
             # Parentheticals: indented to 3.5" from left margin, 2.5" from right margin
             block_format.setIndent(0)
-            block_format.setLeftMargin(3.5 * inch_to_pixels)  # 3.5 inches from left
-            block_format.setRightMargin(2.5 * inch_to_pixels) # 2.5 inches from right
+            block_format.setLeftMargin(_PARENTHETICAL_LEFT)  # 3.5 inches from left
+            block_format.setRightMargin(_PARENTHETICAL_RIGHT) # 2.5 inches from right
             block_format.setAlignment(Qt.AlignmentFlag.AlignLeft)
             block_format.setTopMargin(6)
             block_format.setBottomMargin(6)
@@ -389,77 +452,97 @@ class ScreenplayEditor(QTextEdit):
         self.current_element_type = element_type
         self.apply_format_to_current_line(element_type)
         
+    def switch_element_type(self, element_type):
+        """Make element_type current, format the current line and announce the change"""
+        self.current_element_type = element_type
+        self.apply_format_to_current_line(element_type)
+        self.element_type_changed.emit(element_type)
+        
     def insert_character(self, character_name):
         """Insert a character name at cursor position with proper formatting"""
         cursor = self.textCursor()
         cursor.insertText(character_name)
-        self.current_element_type = "Character"
-        self.apply_format_to_current_line("Character")
-        self.element_type_changed.emit("Character")
+        self.switch_element_type("Character")
         
     def insert_scene(self, scene_name):
         """Insert a scene heading at cursor position with proper formatting"""
         cursor = self.textCursor()
         cursor.insertText(scene_name)
-        self.current_element_type = "Scene Heading"
-        self.apply_format_to_current_line("Scene Heading")
-        self.element_type_changed.emit("Scene Heading")
+        self.switch_element_type("Scene Heading")
         
     def auto_format(self):
         """Auto-format the entire document with proper indentation and alignment"""
-        cursor = self.textCursor()
-        original_position = cursor.position()
+        document = self.document()
         
-        # Start from the beginning
-        cursor.movePosition(QTextCursor.MoveOperation.Start)
+        # Walk the blocks directly rather than moving a cursor through the
+        # document, and apply all formatting as a single edit
+        edit_cursor = QTextCursor(document)
+        edit_cursor.beginEditBlock()
         
         # Process each block
-        while not cursor.atEnd():
-            block = cursor.block()
+        block = document.begin()
+        while block.isValid():
             text = block.text().strip()
             
             if text:
                 element_type = self.detect_element_type(text)
                 
-                # Apply character formatting
-                cursor.setPosition(block.position())
-                cursor.movePosition(QTextCursor.MoveOperation.EndOfBlock, QTextCursor.MoveMode.KeepAnchor)
-                cursor.setCharFormat(self.formats[element_type])
-                
-                # Apply block formatting
-                block_format = self.get_block_format(element_type)
-                cursor.setBlockFormat(block_format)
+                # Skip blocks whose actual formats already match; this reads
+                # the document itself, so it stays correct across undo
+                if not self.has_element_format(block, element_type):
+                    # Apply character formatting
+                    cursor = QTextCursor(block)
+                    cursor.movePosition(QTextCursor.MoveOperation.EndOfBlock, QTextCursor.MoveMode.KeepAnchor)
+                    cursor.setCharFormat(self.formats[element_type])
+                    
+                    # Apply block formatting
+                    block_format = self.get_block_format(element_type)
+                    cursor.setBlockFormat(block_format)
+                    
+                # The typing check relies on the recorded type, which undo does not restore
+                self.mark_element_type(block, element_type)
             
-            cursor.movePosition(QTextCursor.MoveOperation.NextBlock)
+            block = block.next()
             
-        # Restore cursor position
-        cursor.setPosition(original_position)
-        self.setTextCursor(cursor)
+        edit_cursor.endEditBlock()
+        
+    def has_element_format(self, block, element_type):
+        """Check whether block already carries element_type's block and character formats"""
+        if block.blockFormat() != self.get_block_format(element_type):
+            return False
+        char_format = self.formats[element_type]
+        fragments = block.begin()
+        while not fragments.atEnd():
+            if fragments.fragment().charFormat() != char_format:
+                return False
+            fragments += 1
+        return True
         
     def detect_element_type(self, text):
         """Detect element type from text content"""
+        kind = _classify_line(text)
+        
         # Scene heading patterns - check first
-        if re.match(r'^(INT\.|EXT\.|INT\/EXT\.|I\/E\.)', text, re.IGNORECASE):
+        if kind == "scene":
             return "Scene Heading"
             
         # Transition patterns
-        if re.match(r'^(FADE|CUT|DISSOLVE|SMASH|MATCH|JUMP)', text, re.IGNORECASE):
+        if kind == "trans":
             return "Transition"
             
-        # Character name patterns - more reliable detection
-        if (text.isupper() and 
-            not re.match(r'^(INT\.|EXT\.|INT\/EXT\.|I\/E\.|FADE|CUT|DISSOLVE|SMASH|MATCH|JUMP)', text, re.IGNORECASE) and
+        # Character name patterns - more reliable detection; scene headings and
+        # transitions have already been ruled out above
+        if (text.isupper() and
             not text.endswith('.') and
-            len(text.split()) <= 4 and  # Allow up to 4 words for character names
-            len(text) > 0):
+            len(text.split()) <= 4):  # Allow up to 4 words for character names
             return "Character"
             
         # Parenthetical patterns
-        if text.startswith('(') and text.endswith(')'):
+        if kind == "paren":
             return "Parenthetical"
             
         # Shot patterns
-        if re.match(r'^(CLOSE|WIDE|MEDIUM|EXTREME|POV|ANGLE)', text, re.IGNORECASE):
+        if kind == "shot":
             return "Shot"
             
         # Default to Action
@@ -473,11 +556,45 @@ class ScreenplayEditor(QTextEdit):
         
     def set_formatted_text(self, text):
         """Set text and apply formatting"""
-        self.setPlainText(text)
-        self.auto_format()
+        self.last_checked_line = None
+        # Load and format as one edit block with repaints and undo off, so a
+        # large import costs a single layout pass instead of one per block
+        document = self.document()
+        self.setUpdatesEnabled(False)
+        document.setUndoRedoEnabled(False)
+        cursor = QTextCursor(document)
+        cursor.beginEditBlock()
+        try:
+            self.setPlainText(text)
+            self.auto_format()
+        finally:
+            cursor.endEditBlock()
+            document.setUndoRedoEnabled(True)
+            self.setUpdatesEnabled(True)
+        
+    def set_formatted_text_chunks(self, chunks):
+        """Set text from an iterable of string chunks and apply formatting"""
+        self.last_checked_line = None
+        self.setPlainText("")
+        
+        # Insert all chunks and format them as a single edit, like set_formatted_text
+        document = self.document()
+        self.setUpdatesEnabled(False)
+        document.setUndoRedoEnabled(False)
+        cursor = QTextCursor(document)
+        cursor.beginEditBlock()
+        try:
+            for chunk in chunks:
+                cursor.insertText(chunk)
+            self.auto_format()
+        finally:
+            cursor.endEditBlock()
+            document.setUndoRedoEnabled(True)
+            self.setUpdatesEnabled(True)
         
     def clear(self):
         """Clear the document and reset to Scene Heading format"""
         super().clear()
+        self.last_checked_line = None
         self.current_element_type = "Scene Heading"
         self.element_type_changed.emit("Scene Heading") 
\ No newline at end of file
@@ -3,19 +3,86 @@ SDft Manager Component
 Handles saving and loading screenplay documents in custom XML format (.sdft)
 """
 
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
-import re
+from lxml import etree
 from PyQt6.QtWidgets import QFileDialog, QMessageBox
 from PyQt6.QtGui import QTextCursor, QTextCharFormat, QTextBlockFormat, QFont
 from PyQt6.QtCore import Qt
 
+# Fixed element prefixes checked for every block on save; text is matched
+# case-insensitively with str.startswith
+_SCENE_PREFIXES = ('INT.', 'EXT.', 'INT/EXT.', 'I/E.')
+_TRANSITION_PREFIXES = ('FADE', 'CUT', 'DISSOLVE', 'SMASH', 'MATCH', 'JUMP')
+_SHOT_PREFIXES = ('CLOSE', 'WIDE', 'MEDIUM', 'EXTREME', 'POV', 'ANGLE')
+# Longest prefix above, so only that much of a block needs uppercasing
+_MAX_PREFIX_LEN = 8
+
+# Block alignments as stored in SDft files, and back; anything else is saved as left
+_ALIGNMENT_NAMES = {
+    Qt.AlignmentFlag.AlignLeft: "left",
+    Qt.AlignmentFlag.AlignRight: "right",
+    Qt.AlignmentFlag.AlignCenter: "center",
+}
+_ALIGNMENT_FLAGS = {name: flag for flag, name in _ALIGNMENT_NAMES.items()}
+
+_SDFT_NAMESPACE = "http://scriptdraft.app/sdft"
+# Version 1.1 files only store formatting that differs from the element type's
+# defaults; in 1.0 files a missing formatting value means zero
+_SDFT_VERSION = "1.1"
+_SDFT_LEGACY_VERSION = "1.0"
+
+# Escapes for the hand-written SDft output, applied with a single str.translate;
+# a literal \r would be normalized away by the parser, so it is written as a reference
+_XML_ESC = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', '\r': '&#13;'})
+# Attribute values also keep their whitespace characters
+_XML_ATTR_ESC = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;',
+                               '\r': '&#13;', '\n': '&#10;', '\t': '&#9;'})
+
+def _escape(text):
+    """Escape text for use as XML character data"""
+    return text.translate(_XML_ESC)
+
+def _escape_attr(value):
+    """Escape text for use as a double-quoted XML attribute value"""
+    return value.translate(_XML_ATTR_ESC)
+
+def _qt_length(text):
+    """Return the length of text in UTF-16 code units, as Qt counts positions"""
+    if text.isascii():
+        return len(text)
+    return len(text.encode('utf-16-le')) // 2
+
+def _is_character_cue(text):
+    """Check whether text looks like a character cue: short, all caps, no final period
+    
+    Each check is a single C-level pass and they run cheapest first, so long
+    action lines are rejected by the bounded split before isupper() scans them.
+    """
+    return (not text.endswith('.') and
+            len(text.split(None, 3)) <= 3 and
+            text.isupper())
+
+# Clark-notation tags, built once rather than per block
+_T_METADATA = f"{{{_SDFT_NAMESPACE}}}metadata"
+_T_TITLE = f"{{{_SDFT_NAMESPACE}}}title"
+_T_AUTHOR = f"{{{_SDFT_NAMESPACE}}}author"
+_T_CONTACT = f"{{{_SDFT_NAMESPACE}}}contact_info"
+_T_CONTENT = f"{{{_SDFT_NAMESPACE}}}content"
+_T_ELEMENT = f"{{{_SDFT_NAMESPACE}}}element"
+_T_FORMATTING = f"{{{_SDFT_NAMESPACE}}}formatting"
+_T_LEFT_MARGIN = f"{{{_SDFT_NAMESPACE}}}left_margin"
+_T_RIGHT_MARGIN = f"{{{_SDFT_NAMESPACE}}}right_margin"
+_T_ALIGNMENT = f"{{{_SDFT_NAMESPACE}}}alignment"
+_T_TOP_MARGIN = f"{{{_SDFT_NAMESPACE}}}top_margin"
+_T_BOTTOM_MARGIN = f"{{{_SDFT_NAMESPACE}}}bottom_margin"
+
 class SDftManager:
     """Manages SDft (ScriptDraft Format) file operations"""
     
     def __init__(self):
-        self.namespace = "http://scriptdraft.app/sdft"
-        ET.register_namespace('sdft', self.namespace)
+        self.namespace = _SDFT_NAMESPACE
+        # Formats that depend only on the element type, built on first use
+        self.char_formats = {}
+        self.default_block_formats = {}
         
     def save_document(self, screenplay_editor, title_page_manager=None, file_path=None):
         """Save the screenplay document in SDft format"""
@@ -31,55 +98,55 @@ class SDftManager:
             file_path += '.sdft'
             
         try:
-            # Create the root element
-            root = ET.Element(f"{{{self.namespace}}}screenplay")
-            root.set("version", "1.0")
-            root.set("format", "industry-standard")
-            
-            # Add metadata
-            metadata = ET.SubElement(root, f"{{{self.namespace}}}metadata")
+            # Write the XML text straight into a list of parts instead of
+            # building an element tree and serializing it afterwards
+            parts = [
+                "<?xml version='1.0' encoding='utf-8'?>\n",
+                f'<sdft:screenplay xmlns:sdft="{_SDFT_NAMESPACE}" version="{_SDFT_VERSION}" format="industry-standard">\n',
+                "  <sdft:metadata>\n",
+            ]
             
             # Add title page information if available
             if title_page_manager:
                 title_page_info = title_page_manager.get_title_page_info()
-                title_elem = ET.SubElement(metadata, f"{{{self.namespace}}}title")
-                title_elem.text = title_page_info.get('title', 'Untitled Screenplay')
-                
-                author_elem = ET.SubElement(metadata, f"{{{self.namespace}}}author")
-                author_elem.text = title_page_info.get('author', '')
-                
-                contact_elem = ET.SubElement(metadata, f"{{{self.namespace}}}contact_info")
-                contact_elem.text = title_page_info.get('contact_info', '')
+                title = _escape(title_page_info.get('title', 'Untitled Screenplay'))
+                author = _escape(title_page_info.get('author', ''))
+                contact_info = _escape(title_page_info.get('contact_info', ''))
+                parts.append(f"    <sdft:title>{title}</sdft:title>\n")
+                parts.append(f"    <sdft:author>{author}</sdft:author>\n")
+                parts.append(f"    <sdft:contact_info>{contact_info}</sdft:contact_info>\n")
             else:
-                title_elem = ET.SubElement(metadata, f"{{{self.namespace}}}title")
-                title_elem.text = "Untitled Screenplay"
+                parts.append("    <sdft:title>Untitled Screenplay</sdft:title>\n")
+            parts.append("  </sdft:metadata>\n")
             
             # Add content
-            content = ET.SubElement(root, f"{{{self.namespace}}}content")
+            parts.append("  <sdft:content>\n")
             
-            # Process each block in the document
-            cursor = screenplay_editor.textCursor()
-            cursor.movePosition(QTextCursor.MoveOperation.Start)
+            # Process each block in the document, walking the blocks directly
+            # rather than moving a cursor through them
+            block = screenplay_editor.document().firstBlock()
             
-            while not cursor.atEnd():
-                block = cursor.block()
+            while block.isValid():
                 text = block.text()
                 
                 if text.strip():  # Only process non-empty blocks
                     element_type = self.detect_element_type(text)
-                    element = self.create_element_element(content, element_type, text)
+                    parts.append(f'    <sdft:element type="{_escape_attr(element_type)}">{_escape(text)}')
                     
                     # Add formatting information
-                    self.add_formatting_info(element, block, screenplay_editor)
+                    if self.add_formatting_info(parts, block, screenplay_editor, element_type):
+                        parts.append("    </sdft:element>\n")
+                    else:
+                        parts.append("</sdft:element>\n")
                 
-                cursor.movePosition(QTextCursor.MoveOperation.NextBlock)
+                block = block.next()
             
-            # Create pretty XML
-            xml_str = self.prettify_xml(root)
+            parts.append("  </sdft:content>\n</sdft:screenplay>")
             
-            # Write to file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(xml_str)
+            # Write the parts to file through its buffer rather than joining
+            # them into one string first
+            with open(file_path, 'w', encoding='utf-8', buffering=1 << 16) as f:
+                f.writelines(parts)
                 
             return True
             
@@ -98,36 +165,80 @@ class SDftManager:
             return False
             
         try:
-            # Parse XML
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-            
-            # Load title page information if available
-            if title_page_manager:
-                metadata = root.find(f"{{{self.namespace}}}metadata")
-                if metadata is not None:
-                    title_elem = metadata.find(f"{{{self.namespace}}}title")
-                    author_elem = metadata.find(f"{{{self.namespace}}}author")
-                    contact_elem = metadata.find(f"{{{self.namespace}}}contact_info")
+            # Parse XML incrementally; the first event is the root's start.
+            # SDft files never declare entities, so none are expanded
+            events = etree.iterparse(file_path, events=("start", "end"), resolve_entities=False)
+            _, root = next(events)
+            legacy_format = root.get("version", _SDFT_LEGACY_VERSION) == _SDFT_LEGACY_VERSION
+            
+            # Depth below the root of the element being parsed
+            depth = 0
+            content = None
+            # (title, author, contact_info) from the metadata, applied only
+            # once the whole file has parsed
+            title_page_info = None
+            content_loaded = False
+            # Text, element type and block format of each block, in order
+            blocks = []
+            for event, elem in events:
+                if event == "start":
+                    depth += 1
+                    if depth == 1 and elem.tag == _T_CONTENT and not content_loaded:
+                        content = elem
+                    continue
                     
-                    title = title_elem.text if title_elem is not None else ""
-                    author = author_elem.text if author_elem is not None else ""
-                    contact_info = contact_elem.text if contact_elem is not None else ""
+                if depth == 1:
+                    if elem.tag == _T_METADATA and title_page_info is None:
+                        # Read title page information if available
+                        title_page_info = self.read_metadata(elem)
+                    elif elem is content:
+                        content = None
+                        content_loaded = True
+                    elem.clear()
+                elif depth == 2 and content is not None and elem.tag == _T_ELEMENT:
+                    element_type = elem.get("type", "Action")
+                    text = elem.text or ""
+                    block_format = self.get_block_format(element_type, elem, legacy_format)
+                    blocks.append((text, element_type, block_format))
                     
-                    title_page_manager.set_title_page_info(title, author, contact_info)
-            
+                    # Drop the parsed block and the content's reference to it
+                    content.clear()
+                depth -= 1
+                
+            # The file parsed completely, so it is safe to replace the title
+            # page and the script
+            if title_page_manager and title_page_info is not None:
+                title_page_manager.set_title_page_info(*title_page_info)
+                
             # Clear current content
             screenplay_editor.clear()
             
-            # Process content
-            content = root.find(f"{{{self.namespace}}}content")
-            if content is not None:
-                for element in content.findall(f"{{{self.namespace}}}element"):
-                    element_type = element.get("type", "Action")
-                    text = element.text or ""
-                    
-                    # Insert text with proper formatting
-                    self.insert_formatted_element(screenplay_editor, element_type, text, element)
+            # Insert all text in one call and then format it through the same
+            # cursor, as a single edit with repaints and undo off, so the load
+            # costs one layout pass instead of one per block
+            document = screenplay_editor.document()
+            undo_enabled = document.isUndoRedoEnabled()
+            screenplay_editor.setUpdatesEnabled(False)
+            document.setUndoRedoEnabled(False)
+            cursor = QTextCursor(document)
+            cursor.beginEditBlock()
+            try:
+                cursor.insertText("".join(text + "\n" for text, _, _ in blocks))
+                
+                position = 0
+                for text, element_type, block_format in blocks:
+                    end = position + _qt_length(text)
+                    cursor.setPosition(position)
+                    cursor.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
+                    cursor.setCharFormat(self.get_char_format(element_type))
+                    cursor.setBlockFormat(block_format)
+                    # Record the restored type so typing on the line keeps the file's formatting
+                    screenplay_editor.mark_element_type(cursor.block(), element_type)
+                    position = end + 1
+            finally:
+                cursor.endEditBlock()
+                document.setUndoRedoEnabled(undo_enabled)
+                screenplay_editor.setUpdatesEnabled(True)
                     
             return True
             
@@ -135,21 +246,32 @@ class SDftManager:
             QMessageBox.critical(None, "Error", f"Could not load SDft file: {str(e)}")
             return False
             
+    def read_metadata(self, metadata):
+        """Return the (title, author, contact_info) fields of a metadata element"""
+        title_elem = metadata.find(_T_TITLE)
+        author_elem = metadata.find(_T_AUTHOR)
+        contact_elem = metadata.find(_T_CONTACT)
+        
+        title = title_elem.text if title_elem is not None else ""
+        author = author_elem.text if author_elem is not None else ""
+        contact_info = contact_elem.text if contact_elem is not None else ""
+        
+        return title, author, contact_info
+        
     def detect_element_type(self, text):
         """Detect element type from text content"""
+        head = text[:_MAX_PREFIX_LEN].upper()
+        
         # Scene heading patterns
-        if re.match(r'^(INT\.|EXT\.|INT\/EXT\.|I\/E\.)', text, re.IGNORECASE):
+        if head.startswith(_SCENE_PREFIXES):
             return "Scene Heading"
             
         # Transition patterns
-        if re.match(r'^(FADE|CUT|DISSOLVE|SMASH|MATCH|JUMP)', text, re.IGNORECASE):
+        if head.startswith(_TRANSITION_PREFIXES):
             return "Transition"
             
-        # Character name patterns
-        if (text.isupper() and 
-            not re.match(r'^(INT\.|EXT\.|INT\/EXT\.|I\/E\.|FADE|CUT|DISSOLVE)', text, re.IGNORECASE) and
-            not text.endswith('.') and
-            len(text.split()) <= 3):
+        # Character name patterns; scene and transition prefixes are already ruled out
+        if _is_character_cue(text):
             return "Character"
             
         # Parenthetical patterns
@@ -157,165 +279,158 @@ class SDftManager:
             return "Parenthetical"
             
         # Shot patterns
-        if re.match(r'^(CLOSE|WIDE|MEDIUM|EXTREME|POV|ANGLE)', text, re.IGNORECASE):
+        if head.startswith(_SHOT_PREFIXES):
             return "Shot"
             
         # Default to Action
         return "Action"
         
-    def create_element_element(self, parent, element_type, text):
-        """Create an element XML element"""
-        element = ET.SubElement(parent, f"{{{self.namespace}}}element")
-        element.set("type", element_type)
-        element.text = text
-        return element
+    def add_formatting_info(self, parts, block, screenplay_editor, element_type):
+        """Append the XML for a block's formatting information to parts
         
-    def add_formatting_info(self, element, block, screenplay_editor):
-        """Add formatting information to the element"""
-        # Get block format
+        Only values that differ from the element type's defaults are written.
+        Returns False, writing nothing, when the block has no such values.
+        """
+        # Get block format and the defaults it is compared against
         block_format = block.blockFormat()
-        
-        # Add indentation information
-        formatting = ET.SubElement(element, f"{{{self.namespace}}}formatting")
+        default_block_format = self.get_default_block_format(element_type)
+        fields = []
         
         # Left margin (indentation)
         left_margin = block_format.leftMargin()
-        if left_margin > 0:
-            left_margin_elem = ET.SubElement(formatting, f"{{{self.namespace}}}left_margin")
-            left_margin_elem.text = str(left_margin)
+        if left_margin != default_block_format.leftMargin():
+            fields.append(f"        <sdft:left_margin>{left_margin}</sdft:left_margin>\n")
             
         # Right margin
         right_margin = block_format.rightMargin()
-        if right_margin > 0:
-            right_margin_elem = ET.SubElement(formatting, f"{{{self.namespace}}}right_margin")
-            right_margin_elem.text = str(right_margin)
+        if right_margin != default_block_format.rightMargin():
+            fields.append(f"        <sdft:right_margin>{right_margin}</sdft:right_margin>\n")
             
         # Alignment
         alignment = block_format.alignment()
-        alignment_elem = ET.SubElement(formatting, f"{{{self.namespace}}}alignment")
-        if alignment == Qt.AlignmentFlag.AlignLeft:
-            alignment_elem.text = "left"
-        elif alignment == Qt.AlignmentFlag.AlignRight:
-            alignment_elem.text = "right"
-        elif alignment == Qt.AlignmentFlag.AlignCenter:
-            alignment_elem.text = "center"
-        else:
-            alignment_elem.text = "left"
+        if alignment != default_block_format.alignment():
+            alignment_text = _ALIGNMENT_NAMES.get(alignment, "left")
+            fields.append(f"        <sdft:alignment>{alignment_text}</sdft:alignment>\n")
             
         # Top and bottom margins
         top_margin = block_format.topMargin()
-        if top_margin > 0:
-            top_margin_elem = ET.SubElement(formatting, f"{{{self.namespace}}}top_margin")
-            top_margin_elem.text = str(top_margin)
+        if top_margin != default_block_format.topMargin():
+            fields.append(f"        <sdft:top_margin>{top_margin}</sdft:top_margin>\n")
             
         bottom_margin = block_format.bottomMargin()
-        if bottom_margin > 0:
-            bottom_margin_elem = ET.SubElement(formatting, f"{{{self.namespace}}}bottom_margin")
-            bottom_margin_elem.text = str(bottom_margin)
+        if bottom_margin != default_block_format.bottomMargin():
+            fields.append(f"        <sdft:bottom_margin>{bottom_margin}</sdft:bottom_margin>\n")
             
         # Character formatting
         char_format = block.charFormat()
-        char_formatting = ET.SubElement(formatting, f"{{{self.namespace}}}character_format")
+        default_char_format = self.get_char_format(element_type)
+        char_fields = []
         
         # Font weight
         font_weight = char_format.fontWeight()
-        weight_elem = ET.SubElement(char_formatting, f"{{{self.namespace}}}font_weight")
-        weight_elem.text = str(font_weight)
+        if font_weight != default_char_format.fontWeight():
+            char_fields.append(f"          <sdft:font_weight>{font_weight}</sdft:font_weight>\n")
         
         # Font capitalization
         font_cap = char_format.fontCapitalization()
-        cap_elem = ET.SubElement(char_formatting, f"{{{self.namespace}}}font_capitalization")
-        cap_elem.text = str(font_cap)
+        if font_cap != default_char_format.fontCapitalization():
+            char_fields.append(f"          <sdft:font_capitalization>{str(font_cap)}</sdft:font_capitalization>\n")
         
         # Font italic
         font_italic = char_format.fontItalic()
-        italic_elem = ET.SubElement(char_formatting, f"{{{self.namespace}}}font_italic")
-        italic_elem.text = str(font_italic)
-        
-    def insert_formatted_element(self, screenplay_editor, element_type, text, element_xml):
-        """Insert a formatted element into the screenplay editor"""
-        cursor = screenplay_editor.textCursor()
-        
-        # Move to end of document
-        cursor.movePosition(QTextCursor.MoveOperation.End)
-        
-        # Insert text
-        cursor.insertText(text)
-        
-        # Apply formatting
-        self.apply_formatting_from_xml(cursor, element_type, element_xml)
-        
-        # Insert newline
-        cursor.insertText("\n")
-        
-    def apply_formatting_from_xml(self, cursor, element_type, element_xml):
-        """Apply formatting from XML element"""
-        # Select the inserted text
-        cursor.movePosition(QTextCursor.MoveOperation.StartOfBlock)
-        cursor.movePosition(QTextCursor.MoveOperation.EndOfBlock, QTextCursor.MoveMode.KeepAnchor)
+        if font_italic != default_char_format.fontItalic():
+            char_fields.append(f"          <sdft:font_italic>{font_italic}</sdft:font_italic>\n")
+            
+        if char_fields:
+            fields.append("        <sdft:character_format>\n")
+            fields.extend(char_fields)
+            fields.append("        </sdft:character_format>\n")
+            
+        if not fields:
+            return False
+            
+        parts.append("<sdft:formatting>\n")
+        parts.extend(fields)
+        parts.append("      </sdft:formatting>\n")
+        return True
         
-        # Apply character formatting
-        char_format = QTextCharFormat()
+    def get_block_format(self, element_type, element_xml, legacy_format=False):
+        """Return the block format for a loaded element
         
-        # Set font weight based on element type
-        if element_type in ["Scene Heading", "Character", "Transition", "Shot"]:
-            char_format.setFontWeight(700)  # Bold
+        Elements without <formatting> share the default format for their type.
+        Values missing from <formatting> keep the type's default, or are left
+        unset for legacy_format (version 1.0) files.
+        """
+        formatting_xml = element_xml.find(_T_FORMATTING)
+        if formatting_xml is None:
+            return self.get_default_block_format(element_type)
+            
+        # Apply block formatting from the XML
+        if legacy_format:
+            block_format = QTextBlockFormat()
         else:
-            char_format.setFontWeight(400)  # Normal
+            block_format = QTextBlockFormat(self.get_default_block_format(element_type))
+        
+        # Left margin
+        left_margin_elem = formatting_xml.find(_T_LEFT_MARGIN)
+        if left_margin_elem is not None:
+            block_format.setLeftMargin(float(left_margin_elem.text))
             
-        # Set font capitalization
-        if element_type in ["Scene Heading", "Character", "Transition", "Shot"]:
-            char_format.setFontCapitalization(QFont.Capitalization.AllUppercase)
-        else:
-            char_format.setFontCapitalization(QFont.Capitalization.MixedCase)
+        # Right margin
+        right_margin_elem = formatting_xml.find(_T_RIGHT_MARGIN)
+        if right_margin_elem is not None:
+            block_format.setRightMargin(float(right_margin_elem.text))
+            
+        # Alignment
+        alignment_elem = formatting_xml.find(_T_ALIGNMENT)
+        if alignment_elem is not None:
+            block_format.setAlignment(_ALIGNMENT_FLAGS.get(alignment_elem.text, Qt.AlignmentFlag.AlignLeft))
+                
+        # Top margin
+        top_margin_elem = formatting_xml.find(_T_TOP_MARGIN)
+        if top_margin_elem is not None:
+            block_format.setTopMargin(float(top_margin_elem.text))
             
-        # Set font italic
-        if element_type == "Parenthetical":
-            char_format.setFontItalic(True)
+        # Bottom margin
+        bottom_margin_elem = formatting_xml.find(_T_BOTTOM_MARGIN)
+        if bottom_margin_elem is not None:
+            block_format.setBottomMargin(float(bottom_margin_elem.text))
             
-        cursor.setCharFormat(char_format)
-        
-        # Apply block formatting
-        block_format = QTextBlockFormat()
+        return block_format
         
-        # Get formatting from XML if available
-        formatting_xml = element_xml.find(f"{{{self.namespace}}}formatting")
-        if formatting_xml is not None:
-            # Left margin
-            left_margin_elem = formatting_xml.find(f"{{{self.namespace}}}left_margin")
-            if left_margin_elem is not None:
-                block_format.setLeftMargin(float(left_margin_elem.text))
+    def get_char_format(self, element_type):
+        """Return the shared character format for an element type"""
+        char_format = self.char_formats.get(element_type)
+        if char_format is None:
+            char_format = QTextCharFormat()
+            
+            # Set font weight based on element type
+            if element_type in ["Scene Heading", "Character", "Transition", "Shot"]:
+                char_format.setFontWeight(700)  # Bold
+            else:
+                char_format.setFontWeight(400)  # Normal
                 
-            # Right margin
-            right_margin_elem = formatting_xml.find(f"{{{self.namespace}}}right_margin")
-            if right_margin_elem is not None:
-                block_format.setRightMargin(float(right_margin_elem.text))
+            # Set font capitalization
+            if element_type in ["Scene Heading", "Character", "Transition", "Shot"]:
+                char_format.setFontCapitalization(QFont.Capitalization.AllUppercase)
+            else:
+                char_format.setFontCapitalization(QFont.Capitalization.MixedCase)
                 
-            # Alignment
-            alignment_elem = formatting_xml.find(f"{{{self.namespace}}}alignment")
-            if alignment_elem is not None:
-                alignment_text = alignment_elem.text
-                if alignment_text == "right":
-                    block_format.setAlignment(Qt.AlignmentFlag.AlignRight)
-                elif alignment_text == "center":
-                    block_format.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                else:
-                    block_format.setAlignment(Qt.AlignmentFlag.AlignLeft)
-                    
-            # Top margin
-            top_margin_elem = formatting_xml.find(f"{{{self.namespace}}}top_margin")
-            if top_margin_elem is not None:
-                block_format.setTopMargin(float(top_margin_elem.text))
+            # Set font italic
+            if element_type == "Parenthetical":
+                char_format.setFontItalic(True)
                 
-            # Bottom margin
-            bottom_margin_elem = formatting_xml.find(f"{{{self.namespace}}}bottom_margin")
-            if bottom_margin_elem is not None:
-                block_format.setBottomMargin(float(bottom_margin_elem.text))
-        else:
-            # Apply default formatting based on element type
+            self.char_formats[element_type] = char_format
+        return char_format
+        
+    def get_default_block_format(self, element_type):
+        """Return the shared default block format for an element type"""
+        block_format = self.default_block_formats.get(element_type)
+        if block_format is None:
+            block_format = QTextBlockFormat()
             self.apply_default_block_format(block_format, element_type)
-            
-        cursor.setBlockFormat(block_format)
+            self.default_block_formats[element_type] = block_format
+        return block_format
         
     def apply_default_block_format(self, block_format, element_type):
         """Apply default block formatting based on element type"""
@@ -368,9 +483,4 @@ class SDftManager:
             block_format.setAlignment(Qt.AlignmentFlag.AlignLeft)
             block_format.setTopMargin(6)
             block_format.setBottomMargin(6)
-            
-    def prettify_xml(self, element):
-        """Create pretty XML string"""
-        rough_string = ET.tostring(element, 'unicode')
-        reparsed = minidom.parseString(rough_string)
-        return reparsed.toprettyxml(indent="  ") 
\ No newline at end of file
+     
\ No newline at end of file
@@ -4,12 +4,26 @@ Provides auto-complete functionality for character names and locations
 """
 
 import re
+import bisect
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, 
                              QListWidget, QListWidgetItem, QLabel, QPushButton,
                              QCompleter, QComboBox, QCheckBox, QGroupBox, QApplication, QTextEdit)
 from PyQt6.QtCore import pyqtSignal, Qt, QTimer
 from PyQt6.QtGui import QFont, QTextCursor, QKeyEvent
 
+# Scene heading prefix followed by its location (up to any '-')
+_SCENE_LOC_RE = re.compile(r'^(INT\.|EXT\.|INT\/EXT\.|I\/E\.)\s*([^\-]+)', re.IGNORECASE)
+
+# Runs of characters that count as a word; [^\W_] matches exactly str.isalnum
+_WORD_CHARS_RE = re.compile(r'[^\W_]*')
+
+# Common screenplay terms always offered as suggestions
+_COMMON_TERMS = (
+    "INT.", "EXT.", "INT/EXT.", "I/E.",
+    "FADE", "CUT", "DISSOLVE", "SMASH", "MATCH", "JUMP",
+    "CONT'D", "CONTINUED", "V.O.", "O.S.", "O.C.", "O.F.F."
+)
+
 class SmartTypeManager(QWidget):
     """Manages SmartType auto-complete functionality"""
     
@@ -19,9 +33,23 @@ class SmartTypeManager(QWidget):
         super().__init__()
         self.characters = set()
         self.locations = set()
+        # Sorted mirrors of the sets above, kept in step with them
+        self.sorted_characters = []
+        self.sorted_locations = []
+        # Sorted uppercase keys and matching names of every suggestion candidate,
+        # rebuilt on demand after the characters or locations change
+        self.candidate_keys = None
+        self.candidate_names = None
+        # Prefix and result of the last lookup, reused while the prefix grows
+        self.last_prefix = ""
+        self.last_suggestions = []
+        # Word the visible popup was filled for
+        self.shown_word = None
         self.suggestions = []
         self.current_word = ""
         self.cursor_position = 0
+        # Editor the popup is positioned against, set by the editor itself
+        self.editor = None
         self.setup_ui()
         
     def setup_ui(self):
@@ -126,8 +154,10 @@ class SmartTypeManager(QWidget):
         if name:
             if self.auto_capitalize.isChecked():
                 name = name.upper()
-            self.locations.add(name)
-            self.update_location_list()
+            if name not in self.locations:
+                self.locations.add(name)
+                self.invalidate_candidates()
+                self.insert_location_row(name)
             self.loc_input.clear()
             
     def remove_location(self):
@@ -135,19 +165,35 @@ class SmartTypeManager(QWidget):
         current_item = self.loc_list.currentItem()
         if current_item:
             location_name = current_item.text()
-            self.locations.discard(location_name)
-            self.update_location_list()
+            if location_name in self.locations:
+                self.locations.discard(location_name)
+                self.invalidate_candidates()
+                self.remove_location_row(location_name)
             
     def clear_locations(self):
         """Clear all locations"""
         self.locations.clear()
+        self.invalidate_candidates()
         self.update_location_list()
         
     def update_location_list(self):
         """Update the location list display"""
+        # Re-sort once and refill the list in one call
+        self.sorted_locations = sorted(self.locations)
         self.loc_list.clear()
-        for location in sorted(self.locations):
-            self.loc_list.addItem(location)
+        self.loc_list.addItems(self.sorted_locations)
+        
+    def insert_location_row(self, name):
+        """Insert a location into the sorted mirror and the list at the same row"""
+        row = bisect.bisect_left(self.sorted_locations, name)
+        self.sorted_locations.insert(row, name)
+        self.loc_list.insertItem(row, name)
+        
+    def remove_location_row(self, name):
+        """Remove a location from the sorted mirror and the list"""
+        row = bisect.bisect_left(self.sorted_locations, name)
+        del self.sorted_locations[row]
+        self.loc_list.takeItem(row)
             
     def on_loc_selected(self, item):
         """Handle location selection"""
@@ -155,7 +201,10 @@ class SmartTypeManager(QWidget):
         self.suggestion_selected.emit(location_name)
         
     def process_text_input(self, text, cursor_position):
-        """Process text input and generate suggestions"""
+        """Process text input and generate suggestions
+        
+        text is the line being edited and cursor_position the offset within it.
+        """
         if not self.auto_complete_enabled.isChecked():
             return
             
@@ -173,64 +222,86 @@ class SmartTypeManager(QWidget):
         if cursor_position > len(text):
             return ""
             
-        # Find the start of the current word
-        start = cursor_position
-        while start > 0 and text[start - 1].isalnum():
-            start -= 1
-            
-        # Find the end of the current word
-        end = cursor_position
-        while end < len(text) and text[end].isalnum():
-            end += 1
-            
+        # Find the start of the current word by matching backwards over the
+        # reversed text before the cursor, and its end by matching forwards
+        start = cursor_position - _WORD_CHARS_RE.match(text[:cursor_position][::-1]).end()
+        end = _WORD_CHARS_RE.match(text, cursor_position).end()
+        
         return text[start:end]
         
+    def invalidate_candidates(self):
+        """Drop the sorted suggestion candidates after characters or locations change"""
+        self.candidate_keys = None
+        self.candidate_names = None
+        self.last_prefix = ""
+        self.last_suggestions = []
+        self.shown_word = None
+        
+    def build_candidates(self):
+        """Sort characters, locations and common terms by their uppercase form"""
+        candidates = sorted(
+            (name.upper(), name)
+            for names in (self.characters, self.locations, _COMMON_TERMS)
+            for name in names
+        )
+        self.candidate_keys = [key for key, _ in candidates]
+        self.candidate_names = [name for _, name in candidates]
+        
     def generate_suggestions(self, partial_word):
         """Generate suggestions based on partial word"""
-        suggestions = []
         partial_upper = partial_word.upper()
         
-        # Add character suggestions
-        for character in self.characters:
-            if character.upper().startswith(partial_upper):
-                suggestions.append(character)
-                
-        # Add location suggestions
-        for location in self.locations:
-            if location.upper().startswith(partial_upper):
-                suggestions.append(location)
-                
-        # Add common screenplay terms
-        common_terms = [
-            "INT.", "EXT.", "INT/EXT.", "I/E.",
-            "FADE", "CUT", "DISSOLVE", "SMASH", "MATCH", "JUMP",
-            "CONT'D", "CONTINUED", "V.O.", "O.S.", "O.C.", "O.F.F."
-        ]
-        
-        for term in common_terms:
-            if term.upper().startswith(partial_upper):
-                suggestions.append(term)
-                
-        return suggestions[:10]  # Limit to 10 suggestions
+        # A longer prefix only narrows the last result, which is complete
+        # unless it was cut off at the limit
+        if (self.last_prefix and partial_upper.startswith(self.last_prefix) and
+                len(self.last_suggestions) < 10):
+            suggestions = [s for s in self.last_suggestions if s.upper().startswith(partial_upper)]
+            self.last_prefix = partial_upper
+            self.last_suggestions = suggestions
+            return suggestions
+            
+        if self.candidate_keys is None:
+            self.build_candidates()
+        keys = self.candidate_keys
+        
+        # Matches form one contiguous run of the sorted keys
+        suggestions = []
+        index = bisect.bisect_left(keys, partial_upper)
+        while index < len(keys) and keys[index].startswith(partial_upper):
+            suggestions.append(self.candidate_names[index])
+            if len(suggestions) == 10:  # Limit to 10 suggestions
+                break
+            index += 1
+            
+        self.last_prefix = partial_upper
+        self.last_suggestions = suggestions
+        return suggestions
         
     def show_suggestions_popup(self):
         """Show the suggestions popup"""
         if not self.show_suggestions.isChecked():
             return
             
+        # The popup is already showing suggestions for this word
+        if self.current_word == self.shown_word and self.suggestion_popup.isVisible():
+            return
+            
         suggestions = self.generate_suggestions(self.current_word)
         
         if suggestions:
-            self.suggestion_popup.clear()
-            for suggestion in suggestions:
-                self.suggestion_popup.addItem(suggestion)
+            # The popup keeps its items while hidden, so only refill it when
+            # the suggestions differ from the ones it holds
+            if suggestions != self.suggestions:
+                self.suggestion_popup.clear()
+                self.suggestion_popup.addItems(suggestions)
+                self.suggestions = suggestions
             
             # Position the popup near the cursor
             self.position_popup_near_cursor()
             
             self.suggestion_popup.setVisible(True)
             self.suggestion_popup.raise_()
-            self.suggestions = suggestions
+            self.shown_word = self.current_word
         else:
             self.hide_suggestions_popup()
             
@@ -241,17 +312,13 @@ class SmartTypeManager(QWidget):
         if not app:
             return
             
-        # Get the active window (should be the main window)
-        main_window = app.activeWindow()
-        if not main_window:
-            return
-            
-        # Get the text editor widget
-        text_editor = None
-        for child in main_window.findChildren(QTextEdit):
-            if child.hasFocus():
-                text_editor = child
-                break
+        # Use the registered editor rather than searching the widget tree,
+        # falling back to the focused text editor
+        text_editor = self.editor
+        if text_editor is None:
+            focus_widget = app.focusWidget()
+            if isinstance(focus_widget, QTextEdit):
+                text_editor = focus_widget
                 
         if not text_editor:
             return
@@ -279,6 +346,10 @@ class SmartTypeManager(QWidget):
         self.suggestion_popup.move(popup_x, popup_y)
         self.suggestion_popup.resize(popup_width, popup_height)
         
+    def set_editor(self, editor):
+        """Set the text editor the suggestion popup is shown for"""
+        self.editor = editor
+        
     def hide_suggestions_popup(self):
         """Hide the suggestions popup"""
         self.suggestion_popup.setVisible(False)
@@ -297,26 +368,29 @@ class SmartTypeManager(QWidget):
         """Update character list from character manager"""
         # Only use full, valid character names
         self.characters = set([c for c in characters if len(c) > 1])
+        self.sorted_characters = sorted(self.characters)
+        self.invalidate_candidates()
         # No need to update a character list UI anymore
         
     def update_from_scene_manager(self, scenes):
         """Update location list from scene manager"""
-        # Only use full, valid locations
-        locations = set()
-        for scene in scenes:
-            # Extract location from scene heading (after INT./EXT./etc.)
-            match = re.match(r'^(INT\.|EXT\.|INT\/EXT\.|I\/E\.)\s*([^\-]+)', scene, re.IGNORECASE)
-            if match:
-                location = match.group(2).strip()
-                if location and len(location) > 1:
-                    locations.add(location)
+        # Extract locations from scene headings (after INT./EXT./etc.),
+        # keeping only full, valid ones
+        matches = filter(None, map(_SCENE_LOC_RE.match, scenes))
+        locations = {location for location in (m.group(2).strip() for m in matches)
+                     if len(location) > 1}
+        
+        # New scenes often reuse known locations, so the list may not change
+        if locations == self.locations:
+            return
         self.locations = locations
+        self.invalidate_candidates()
         self.update_location_list()
         
     def get_characters(self):
         """Get list of all characters"""
-        return sorted(self.characters)
+        return list(self.sorted_characters)
         
     def get_locations(self):
         """Get list of all locations"""
-        return sorted(self.locations) 
\ No newline at end of file
+        return list(self.sorted_locations) 
\ No newline at end of file
@@ -5,9 +5,13 @@ Handles title page creation and display with industry-standard formatting
 
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, 
                              QLabel, QTextEdit, QPushButton, QGroupBox, QGridLayout)
-from PyQt6.QtCore import pyqtSignal, Qt
+from PyQt6.QtCore import pyqtSignal, pyqtSlot, Qt, QTimer
 from PyQt6.QtGui import QFont, QTextCursor, QTextCharFormat, QTextBlockFormat
 
+# Blank lines above the title and between the sections of the title page
+_SPACER_TOP = "\n" * 20
+_SPACER_MID = "\n" * 8
+
 class TitlePageManager(QWidget):
     """Manages title page creation and display"""
     
@@ -18,8 +22,41 @@ class TitlePageManager(QWidget):
         self.title = ""
         self.author = ""
         self.contact_info = ""
+        self.contact_lines = ()
+        self.last_rendered_state = None
+        self.display_dirty = False
+        self.setup_formats()
+        
+        # Coalesce bursts of keystrokes into a single rebuild of the display
+        self.display_timer = QTimer(self)
+        self.display_timer.setSingleShot(True)
+        self.display_timer.setInterval(150)
+        self.display_timer.timeout.connect(self.render_title_display)
+        
         self.setup_ui()
         
+    def setup_formats(self):
+        """Create the formats shared by every rebuild of the title page"""
+        self.title_char_format = self.create_char_format(18, QFont.Weight.Bold)
+        self.by_char_format = self.create_char_format(12, QFont.Weight.Normal)
+        self.author_char_format = self.create_char_format(14, QFont.Weight.Bold)
+        self.contact_char_format = self.create_char_format(10, QFont.Weight.Normal)
+        
+        self.center_block_format = QTextBlockFormat()
+        self.center_block_format.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        
+        self.left_block_format = QTextBlockFormat()
+        self.left_block_format.setAlignment(Qt.AlignmentFlag.AlignLeft)
+        self.left_block_format.setBottomMargin(0)
+        
+    def create_char_format(self, point_size, weight):
+        """Create a Courier New character format"""
+        char_format = QTextCharFormat()
+        char_format.setFontFamily("Courier New")
+        char_format.setFontPointSize(point_size)
+        char_format.setFontWeight(weight)
+        return char_format
+        
     def setup_ui(self):
         """Setup the title page interface"""
         layout = QVBoxLayout(self)
@@ -49,7 +86,7 @@ class TitlePageManager(QWidget):
         title_label.setFont(QFont("Arial", 10, QFont.Weight.Bold))
         self.title_input = QLineEdit()
         self.title_input.setPlaceholderText("Enter screenplay title")
-        self.title_input.textChanged.connect(self.update_title_display)
+        self.title_input.textChanged.connect(self.on_input_text_changed)
         editor_layout.addWidget(title_label, 0, 0)
         editor_layout.addWidget(self.title_input, 0, 1)
         
@@ -58,7 +95,7 @@ class TitlePageManager(QWidget):
         author_label.setFont(QFont("Arial", 10, QFont.Weight.Bold))
         self.author_input = QLineEdit()
         self.author_input.setPlaceholderText("Enter author name")
-        self.author_input.textChanged.connect(self.update_title_display)
+        self.author_input.textChanged.connect(self.on_input_text_changed)
         editor_layout.addWidget(author_label, 1, 0)
         editor_layout.addWidget(self.author_input, 1, 1)
         
@@ -68,7 +105,7 @@ class TitlePageManager(QWidget):
         self.contact_input = QTextEdit()
         self.contact_input.setMaximumHeight(80)
         self.contact_input.setPlaceholderText("Enter contact information (address, phone, email)")
-        self.contact_input.textChanged.connect(self.update_title_display)
+        self.contact_input.textChanged.connect(self.schedule_title_display)
         editor_layout.addWidget(contact_label, 2, 0)
         editor_layout.addWidget(self.contact_input, 2, 1)
         
@@ -88,171 +125,144 @@ class TitlePageManager(QWidget):
         # Initialize display
         self.update_title_display()
         
+    @pyqtSlot()
     def update_title_display(self):
         """Update the title page display"""
+        self.display_timer.stop()
+        self.read_title_inputs()
+        self.render_title_display()
+        
+        # Emit signal
+        self.title_page_updated.emit()
+        
+    @pyqtSlot(str)
+    def on_input_text_changed(self, _text):
+        """Handle an edit in the title or author field"""
+        self.schedule_title_display()
+        
+    @pyqtSlot()
+    def schedule_title_display(self):
+        """Record edited title page information and rebuild the display once typing pauses"""
+        # The information itself stays current for saves and exports; only
+        # the rebuild of the display is deferred
+        self.read_title_inputs()
+        self.title_page_updated.emit()
+        self.display_timer.start()
+        
+    def read_title_inputs(self):
+        """Read the title page information from the input fields"""
         self.title = self.title_input.text().strip()
         self.author = self.author_input.text().strip()
         self.contact_info = self.contact_input.toPlainText().strip()
+        # Non-empty contact lines as they appear on the page, split once per edit
+        self.contact_lines = tuple(line.strip() for line in self.contact_info.split('\n') if line.strip())
+        
+    @pyqtSlot()
+    def render_title_display(self):
+        """Rebuild the title page display from the current information"""
+        # While another page of the stack is showing, defer the rebuild to showEvent
+        if not self.isVisible():
+            self.display_dirty = True
+            return
+        self.display_dirty = False
+        
+        # Edits that strip down to the same information leave the page as is
+        state = (self.title, self.author, self.contact_lines)
+        if state == self.last_rendered_state:
+            return
+        self.last_rendered_state = state
         
         # Create formatted title page
         title_page_text = self.create_formatted_title_page()
         
-        # Apply formatting
-        self.title_display.clear()
-        cursor = self.title_display.textCursor()
-        cursor.insertText(title_page_text)
-        self.apply_title_page_formatting()
-        self.apply_contact_info_bottom_left()
+        # Rebuild as one edit block with repaints off, so the text and its
+        # formatting cost a single layout pass
+        self.title_display.setUpdatesEnabled(False)
+        edit_cursor = QTextCursor(self.title_display.document())
+        edit_cursor.beginEditBlock()
+        try:
+            self.title_display.clear()
+            cursor = self.title_display.textCursor()
+            cursor.insertText(title_page_text)
+            
+            # Apply formatting
+            self.apply_title_page_formatting()
+            self.apply_contact_info_bottom_left()
+        finally:
+            edit_cursor.endEditBlock()
+            self.title_display.setUpdatesEnabled(True)
         
-        # Emit signal
-        self.title_page_updated.emit()
+    def showEvent(self, event):
+        """Bring the display up to date with edits made while hidden"""
+        if self.display_dirty:
+            self.display_dirty = False
+            self.render_title_display()
+        super().showEvent(event)
         
     def create_formatted_title_page(self):
         """Create the formatted title page text"""
-        lines = []
+        # Title (centered, bold, large) and author (centered)
+        title_line = self.title.upper() if self.title else "UNTITLED SCREENPLAY"
+        author_line = self.author if self.author else "AUTHOR NAME"
+        text = f"{_SPACER_TOP}{title_line}\n{_SPACER_MID}by\n\n{author_line}{_SPACER_MID}"
         
-        # Add spacing for centering
-        for _ in range(20):
-            lines.append("")
-            
-        # Title (centered, bold, large)
-        if self.title:
-            lines.append(self.title.upper())
-        else:
-            lines.append("UNTITLED SCREENPLAY")
-            
-        # Add spacing
-        for _ in range(8):
-            lines.append("")
-            
-        # Author (centered)
-        if self.author:
-            lines.append(f"by")
-            lines.append("")
-            lines.append(self.author)
-        else:
-            lines.append("by")
-            lines.append("")
-            lines.append("AUTHOR NAME")
-            
-        # Add spacing
-        for _ in range(8):
-            lines.append("")
-            
-        # Contact information (centered, smaller)
-        if self.contact_info:
-            contact_lines = self.contact_info.split('\n')
-            for line in contact_lines:
-                if line.strip():
-                    lines.append(line.strip())
-                    
-        return '\n'.join(lines)
+        # Contact information (smaller)
+        if self.contact_lines:
+            text += "\n" + "\n".join(self.contact_lines)
+                
+        return text
         
     def apply_title_page_formatting(self):
         """Apply formatting to the title page display"""
-        cursor = self.title_display.textCursor()
-        cursor.movePosition(QTextCursor.MoveOperation.Start)
-        
         # Set document margins for centering
         doc = self.title_display.document()
         doc.setDocumentMargin(72)  # 1 inch margins
         
         # Apply formatting to title
-        lines = self.title_display.toPlainText().split('\n')
-        current_line = 0
-        
-        for i, line in enumerate(lines):
-            if line.strip():
-                cursor.movePosition(QTextCursor.MoveOperation.Start)
-                cursor.movePosition(QTextCursor.MoveOperation.Down, QTextCursor.MoveMode.MoveAnchor, i)
-                cursor.movePosition(QTextCursor.MoveOperation.EndOfLine, QTextCursor.MoveMode.KeepAnchor)
-                
+        # Formats keyed by line text; later keys win, so the title outranks
+        # "by", which outranks the author. Contact lines are left to
+        # apply_contact_info_bottom_left
+        line_formats = {self.author or "AUTHOR NAME": (self.author_char_format, self.center_block_format)}
+        line_formats["by"] = (self.by_char_format, self.center_block_format)
+        line_formats[self.title.upper() or "UNTITLED SCREENPLAY"] = (self.title_char_format, self.center_block_format)
+        
+        # Walk the blocks directly rather than re-serializing the document to text
+        block = doc.firstBlock()
+        while block.isValid():
+            # Page lines are written stripped, so blank spacers are simply empty
+            line = block.text()
+            formats = line_formats.get(line) if line else None
+            if formats:
                 # Apply formatting based on line content
-                if line == self.title.upper() if self.title else line == "UNTITLED SCREENPLAY":
-                    # Title formatting
-                    char_format = QTextCharFormat()
-                    char_format.setFontFamily("Courier New")
-                    char_format.setFontPointSize(18)
-                    char_format.setFontWeight(QFont.Weight.Bold)
-                    cursor.setCharFormat(char_format)
-                    
-                    # Center the title
-                    block_format = QTextBlockFormat()
-                    block_format.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                    cursor.setBlockFormat(block_format)
-                    
-                elif line == "by":
-                    # "by" formatting
-                    char_format = QTextCharFormat()
-                    char_format.setFontFamily("Courier New")
-                    char_format.setFontPointSize(12)
-                    char_format.setFontWeight(QFont.Weight.Normal)
-                    cursor.setCharFormat(char_format)
-                    
-                    block_format = QTextBlockFormat()
-                    block_format.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                    cursor.setBlockFormat(block_format)
-                    
-                elif line == self.author if self.author else line == "AUTHOR NAME":
-                    # Author formatting
-                    char_format = QTextCharFormat()
-                    char_format.setFontFamily("Courier New")
-                    char_format.setFontPointSize(14)
-                    char_format.setFontWeight(QFont.Weight.Bold)
-                    cursor.setCharFormat(char_format)
-                    
-                    block_format = QTextBlockFormat()
-                    block_format.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                    cursor.setBlockFormat(block_format)
-                    
-                elif line in self.contact_info.split('\n') if self.contact_info else False:
-                    # Contact info formatting
-                    char_format = QTextCharFormat()
-                    char_format.setFontFamily("Courier New")
-                    char_format.setFontPointSize(10)
-                    char_format.setFontWeight(QFont.Weight.Normal)
-                    cursor.setCharFormat(char_format)
-                    
-                    block_format = QTextBlockFormat()
-                    block_format.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                    cursor.setBlockFormat(block_format)
+                char_format, block_format = formats
+                cursor = QTextCursor(block)
+                cursor.movePosition(QTextCursor.MoveOperation.EndOfBlock, QTextCursor.MoveMode.KeepAnchor)
+                cursor.setCharFormat(char_format)
+                cursor.setBlockFormat(block_format)
+            block = block.next()
                     
     def apply_contact_info_bottom_left(self):
         """Apply formatting to move contact info to the bottom left of the page (up to 4 lines)"""
         doc = self.title_display.document()
         block_count = doc.blockCount()
-        contact_lines = self.contact_info.split('\n') if self.contact_info else []
-        # Only use up to 4 lines
-        contact_lines = contact_lines[:4]
-        if not contact_lines:
+        contact_count = len(self.contact_lines)
+        if not contact_count:
             return
-        # Find the last non-empty block (for contact info)
-        block_idx = block_count - len(contact_lines)
-        for i, line in enumerate(contact_lines):
-            block = doc.findBlockByNumber(block_idx + i)
-            cursor = self.title_display.textCursor()
-            cursor.setPosition(block.position())
+        # Contact lines are the last blocks of the page; only the final 4
+        # move to the bottom left, any lines above them stay centered
+        block_idx = block_count - contact_count
+        left_from = max(0, contact_count - 4)
+        for i in range(contact_count):
+            cursor = QTextCursor(doc.findBlockByNumber(block_idx + i))
             cursor.movePosition(QTextCursor.MoveOperation.EndOfBlock, QTextCursor.MoveMode.KeepAnchor)
             # Set left alignment and smaller font
-            char_format = QTextCharFormat()
-            char_format.setFontFamily("Courier New")
-            char_format.setFontPointSize(10)
-            char_format.setFontWeight(QFont.Weight.Normal)
-            cursor.setCharFormat(char_format)
-            block_format = QTextBlockFormat()
-            block_format.setAlignment(Qt.AlignmentFlag.AlignLeft)
-            block_format.setBottomMargin(0)
-            cursor.setBlockFormat(block_format)
-        # Add extra newlines to push contact info to the bottom
-        extra_lines = max(0, 30 - block_count)
-        if extra_lines > 0:
-            self.title_display.append("\n" * extra_lines)
+            cursor.setCharFormat(self.contact_char_format)
+            cursor.setBlockFormat(self.left_block_format if i >= left_from else self.center_block_format)
         
+    @pyqtSlot()
     def clear_title_page(self):
         """Clear all title page information"""
-        self.title_input.clear()
-        self.author_input.clear()
-        self.contact_input.clear()
+        self.set_title_page_info("", "", "")
         
     def get_title_page_info(self):
         """Get title page information"""
@@ -264,9 +274,18 @@ class TitlePageManager(QWidget):
         
     def set_title_page_info(self, title, author, contact_info):
         """Set title page information"""
-        self.title_input.setText(title or "")
-        self.author_input.setText(author or "")
-        self.contact_input.setPlainText(contact_info or "")
+        # Fill all three fields quietly, then rebuild the page once
+        inputs = (self.title_input, self.author_input, self.contact_input)
+        for widget in inputs:
+            widget.blockSignals(True)
+        try:
+            self.title_input.setText(title or "")
+            self.author_input.setText(author or "")
+            self.contact_input.setPlainText(contact_info or "")
+        finally:
+            for widget in inputs:
+                widget.blockSignals(False)
+        self.update_title_display()
         
     def has_content(self):
         """Check if title page has any content"""